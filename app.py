@@ -6,7 +6,9 @@ from components.visualizations import render_visualizations
 from components.data_explorer import render_data_explorer
 from components.prediction import render_prediction
 from components.footer import render_footer
+from components.perf_panel import render_perf_panel
 from utils.styling import apply_styling
+from utils.perf import measure, panel_requested
 
 # Page Configuration
 st.set_page_config(
@@ -24,10 +26,19 @@ df = load_data()
 model_assets = load_model_assets()
 
 if df is not None and model_assets is not None:
-    # Render components
-    render_header()
-    render_quick_stats(df)
-    render_visualizations(df)
-    render_data_explorer(df)
-    render_prediction(model_assets, df)
-    render_footer()
\ No newline at end of file
+    # Render components, timed when perf instrumentation is on
+    with measure("header"):
+        render_header()
+    with measure("quick_stats"):
+        render_quick_stats(df)
+    with measure("visualizations"):
+        render_visualizations(df)
+    with measure("data_explorer"):
+        render_data_explorer(df)
+    with measure("prediction"):
+        render_prediction(model_assets, df)
+    with measure("footer"):
+        render_footer()
+
+    if panel_requested():
+        render_perf_panel(model_assets)
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""Drive many simulated dashboard sessions through app.py and report rerun latency.
+
+Each session is a Streamlit ``AppTest`` running in this process, so all
+sessions share one set of caches exactly as they would on a single server.
+
+Usage:
+    python -m benchmarks.load_test --sessions 1 4 16 --actions 20
+    python -m benchmarks.load_test --rows 1000000 --sessions 8 --output load.json
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+warnings.filterwarnings("ignore")
+
+from streamlit import config, logger
+from streamlit.testing.v1 import AppTest
+from benchmarks.synthetic_data import write_crime_csv
+from utils.model_bundle import BUNDLE_DIR, LEGACY_ARTIFACTS
+
+# Keep streamlit's bare-mode and deprecation chatter out of the report
+config.set_option("logger.level", "error")
+logger.set_log_level("error")
+# AppTest flips this option on only for the duration of each run, which races
+# when sessions overlap; keep it on for the whole process instead
+config.set_option("global.appTest", True)
+
+from components.visualizations import VIZ_TAB_KEY, VIZ_TABS
+
+APP_PATH = os.path.join(ROOT, "app.py")
+ACTIONS = ("filter", "tab", "predict")
+
+def rss_mb():
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        # Peak RSS is the best portable fallback (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+def _timed_run(at, timeout):
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed
+
+def _act(at, action, rng):
+    """Apply one user interaction to a session; returns False if it does not apply."""
+    if action == "filter" and len(at.multiselect):
+        widget = rng.choice(list(at.multiselect))
+        options = list(widget.options)
+        widget.set_value(rng.sample(options, rng.randint(0, min(3, len(options)))))
+        return True
+    if action == "tab":
+        # The visualization tabs run lazily; switch them through their session state key
+        if VIZ_TAB_KEY in at.session_state:
+            at.session_state[VIZ_TAB_KEY] = rng.choice(VIZ_TABS)
+            return True
+        return False
+    if action == "predict":
+        for button in at.button:
+            if button.label == "Generate Prediction":
+                button.click()
+                return True
+    return False
+
+def run_session(session_id, n_actions, timeout, latencies, errors, seed):
+    rng = random.Random(seed + session_id)
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        latencies.append(("initial", _timed_run(at, timeout)))
+        for _ in range(n_actions):
+            action = rng.choice(ACTIONS)
+            if _act(at, action, rng):
+                latencies.append((action, _timed_run(at, timeout)))
+    except Exception as e:
+        errors.append(f"session {session_id}: {e}")
+
+def run_level(n_sessions, n_actions, timeout, seed):
+    """Run ``n_sessions`` concurrent sessions and summarise their reruns."""
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=run_session, args=(i, n_actions, timeout, latencies, errors, seed))
+        for i in range(n_sessions)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    summary = {"sessions": n_sessions, "reruns": len(latencies), "errors": errors,
+               "throughput_rps": len(latencies) / wall, "rss_mb": rss_mb()}
+    for action in ("all",) + ("initial",) + ACTIONS:
+        values = [ms for kind, ms in latencies if action in ("all", kind)]
+        if values:
+            summary[action] = {
+                "count": len(values),
+                "mean_ms": statistics.fmean(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+            }
+    return summary
+
+def prepare_synthetic_workdir(rows, workdir):
+    """Point the app at a synthetic dataset next to links to the real model artifacts."""
+    write_crime_csv(os.path.join(workdir, "rwanda_crime.csv"), rows)
+    for name in LEGACY_ARTIFACTS + (BUNDLE_DIR,):
+        source = os.path.join(ROOT, name)
+        if os.path.exists(source):
+            os.symlink(source, os.path.join(workdir, name))
+    return workdir
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with concurrent sessions.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16], help="concurrency levels")
+    parser.add_argument("--actions", type=int, default=20, help="interactions per session after the first run")
+    parser.add_argument("--rows", type=int, help="use a synthetic dataset of this many rows instead of rwanda_crime.csv")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(prepare_synthetic_workdir(args.rows, workdir) if args.rows else ROOT)
+
+        report = {"rows": args.rows, "baseline_rss_mb": rss_mb(), "levels": []}
+        for n_sessions in args.sessions:
+            summary = run_level(n_sessions, args.actions, args.timeout, args.seed)
+            report["levels"].append(summary)
+            overall = summary.get("all", {})
+            print(
+                f"👥 {n_sessions:>3} sessions: {summary['reruns']:>5} reruns, "
+                f"{summary['throughput_rps']:6.2f} reruns/s, "
+                f"p50 {overall.get('p50_ms', 0):7.1f} ms, p95 {overall.get('p95_ms', 0):7.1f} ms, "
+                f"p99 {overall.get('p99_ms', 0):7.1f} ms, RSS {summary['rss_mb']:.0f} MB"
+            )
+            for error in summary["errors"]:
+                print(f"   ❌ {error}")
+        os.chdir(ROOT)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
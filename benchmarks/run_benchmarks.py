@@ -0,0 +1,193 @@
+"""Time the dashboard's hot paths on synthetic datasets of increasing size.
+
+Usage:
+    python -m benchmarks.run_benchmarks --rows 90 100000 1000000 --output bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json   # flag regressions
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+warnings.filterwarnings("ignore")
+
+# The components import streamlit; keep its bare-mode warnings out of the report
+from streamlit import config, logger
+config.set_option("logger.level", "error")
+logger.set_log_level("error")
+
+from benchmarks.synthetic_data import write_crime_csv
+from components.quick_stats import compute_approximate_stats, get_stats
+from components.visualizations import (
+    create_case_forecast_chart, create_crime_type_chart, create_province_chart, create_time_trend_chart
+)
+from utils.case_forecast import forecast_cases
+from utils.columnar_cache import load_with_cache
+from utils.export import available_formats, write_export
+from utils.filter_index import FilterIndex
+from utils.forecast import province_options
+from utils.ingest import read_crime_csv
+from utils.inference import load_compact_forest, predict_proba
+from utils.model_bundle import load_model_artifacts
+from utils.process_backend import ProcessScorer
+from utils.summary_stats import PartitionStats
+
+DEFAULT_ROWS = [90, 10_000, 100_000, 1_000_000]
+REGRESSION_THRESHOLD = 0.2
+
+def measure(fn, repeats=5, warmup=1):
+    """Run ``fn`` and return timing statistics in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(timings), "min_ms": min(timings), "repeats": repeats}
+
+def _uncached(df):
+    """A view of the frame without a data version, so per-version caches are bypassed."""
+    view = df.copy(deep=False)
+    view.attrs = {}
+    return view
+
+def bench_dataset(rows, workdir, model_assets, repeats):
+    """Benchmark every hot path on one synthetic dataset."""
+    path = os.path.join(workdir, f"crime_{rows}.csv")
+    write_crime_csv(path, rows)
+    results = {}
+
+    results["load_data.parse_csv"] = measure(lambda: read_crime_csv(path), repeats=max(1, repeats // 2), warmup=0)
+    load_with_cache(path, read_crime_csv)
+    results["load_data.columnar_cache"] = measure(lambda: load_with_cache(path, read_crime_csv), repeats)
+
+    df, data_version = load_with_cache(path, read_crime_csv)
+    df.attrs["data_version"] = data_version
+    cold = _uncached(df)
+
+    results["get_stats"] = measure(lambda: get_stats(cold), repeats)
+    results["get_stats.cached_cube"] = measure(lambda: get_stats(df), repeats)
+    # What approximate mode shows while the exact figures above are still being computed
+    results["get_stats.approximate"] = measure(lambda: compute_approximate_stats(cold), repeats)
+    results["create_crime_type_chart"] = measure(lambda: create_crime_type_chart(cold), repeats)
+    results["create_time_trend_chart"] = measure(lambda: create_time_trend_chart(cold), repeats)
+    results["create_province_chart"] = measure(lambda: create_province_chart(cold), repeats)
+    results["create_case_forecast_chart"] = measure(lambda: create_case_forecast_chart(cold), repeats)
+    district_cells = df.groupby(["District", "Crime Detail", "Year"], observed=True)["Number of Cases"].sum()
+    results["forecast.district_series"] = measure(
+        lambda: forecast_cases(district_cells, keys=["District", "Crime Detail"]), repeats
+    )
+
+    selection = {
+        "Year": sorted(df["Year"].unique())[-2:],
+        "Province": list(df["Province"].cat.categories[:2]),
+        "Crime Detail": list(df["Crime Detail"].cat.categories[:3]),
+    }
+    results["explorer.build_index"] = measure(lambda: FilterIndex(df), repeats=max(1, repeats // 2))
+    index = FilterIndex(df)
+    results["explorer.filter"] = measure(lambda: index.filter(selection), repeats)
+    index.rank("Number of Cases", ascending=False)
+    results["explorer.sorted_page"] = measure(
+        lambda: index.window(selection, "Number of Cases", False, offset=100, limit=100), repeats
+    )
+    filtered = index.filter(selection)
+    results["explorer.export_csv"] = measure(lambda: filtered.to_csv(index=False).encode("utf-8"), repeats)
+    results["explorer.describe"] = measure(lambda: filtered.select_dtypes(include="number").describe(), repeats)
+    stats = PartitionStats(df)
+    results["explorer.describe_merged"] = measure(lambda: stats.describe(selection), repeats)
+    positions = index.positions(selection)
+    export_path = os.path.join(workdir, "export")
+    for fmt in available_formats():
+        results[f"explorer.export_chunked.{fmt}"] = measure(
+            lambda: write_export(df, positions, export_path, fmt), repeats
+        )
+    os.remove(export_path)
+
+    if model_assets is not None:
+        encoder = model_assets["encoder"]
+        provinces = province_options(encoder)
+        results["prediction.encode"] = measure(lambda: encoder.encode(provinces[:1], [2025]), repeats)
+        X = encoder.encode(provinces[:1], [2025])
+        results["prediction.predict"] = measure(lambda: predict_proba(model_assets, X), repeats)
+        forest = load_compact_forest(model_assets)
+        if forest is not None:
+            results["prediction.predict_compact"] = measure(lambda: forest.predict_proba(X), repeats)
+        scorer = ProcessScorer(dict(model_assets, compact_forest=forest))
+        results["prediction.predict_process"] = measure(lambda: scorer(X), repeats)
+        scorer.close()
+
+    os.remove(path)
+    return results
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current, baseline_path, threshold=REGRESSION_THRESHOLD):
+    """Print benchmarks that got slower than ``threshold`` versus a saved run."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r["benchmark"], r["rows"]): r["median_ms"] for r in baseline["results"]}
+
+    regressions = []
+    for result in current["results"]:
+        before = previous.get((result["benchmark"], result["rows"]))
+        if before and result["median_ms"] > before * (1 + threshold):
+            regressions.append((result["benchmark"], result["rows"], before, result["median_ms"]))
+
+    for name, rows, before, after in regressions:
+        print(f"⚠️ {name} @ {rows:,} rows: {before:.2f} ms -> {after:.2f} ms")
+    if not regressions:
+        print(f"✅ No regressions over {threshold:.0%} against {baseline.get('revision')}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's hot paths.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="dataset sizes to benchmark")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to check for regressions")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    try:
+        model_assets = load_model_artifacts()
+    except Exception as e:
+        print(f"⚠️ Skipping prediction benchmarks: {e}")
+        model_assets = None
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            print(f"⏱️ {rows:,} rows")
+            for name, timing in bench_dataset(rows, workdir, model_assets, args.repeats).items():
+                report["results"].append({"benchmark": name, "rows": rows, **timing})
+                print(f"   {name:<34} {timing['median_ms']:>10.2f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results saved to {args.output}")
+    if args.compare:
+        if compare(report, args.compare):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
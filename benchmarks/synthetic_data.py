@@ -0,0 +1,78 @@
+"""Synthetic crime datasets shaped like rwanda_crime.csv, from a few rows to 10M+.
+
+Usage:
+    python -m benchmarks.synthetic_data --rows 1000000 --out synthetic_crime.csv
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+BASE_PROVINCES = ["Kigali City", "Eastern", "Northern", "Western", "Southern"]
+BASE_CRIMES = [
+    "Theft", "Fraud", "Use of Threats", "Assault and Battery", "Child Defilement",
+    "Damaging or Plundering of Trees", "Forged Document", "Harassment of Spouse",
+    "Narcotic Drugs", "Others", "Suicide",
+]
+
+def _names(base, prefix, count):
+    return (base + [f"{prefix} {i}" for i in range(len(base) + 1, count + 1)])[:count]
+
+def generate_crime_data(n_rows, n_provinces=5, n_districts=30, n_crime_types=11, years=range(2019, 2025), seed=0, part=0):
+    """Generate a crime dataset with the columns of rwanda_crime.csv plus District.
+
+    Case counts are log-normal with per-province and per-crime effects and a
+    mild yearly trend, so aggregates have realistic skew. The layout (names,
+    district-to-province map, effects) depends only on ``seed``; ``part``
+    varies the rows, so chunks of one dataset can be generated separately.
+    """
+    layout = np.random.default_rng(seed)
+    provinces = _names(BASE_PROVINCES, "Province", n_provinces)
+    crimes = _names(BASE_CRIMES, "Crime Type", n_crime_types)
+    years = np.asarray(list(years))
+
+    district_province = layout.integers(0, n_provinces, n_districts)
+    district_province[:min(n_provinces, n_districts)] = np.arange(min(n_provinces, n_districts))
+    districts = [f"{provinces[p]} District {i + 1}" for i, p in enumerate(district_province)]
+    crime_effect = layout.normal(0, 1, n_crime_types)
+    province_effect = layout.normal(0, 0.5, n_provinces)
+    trend = np.linspace(0, 0.3, len(years))
+
+    rng = np.random.default_rng([seed, part])
+    crime_codes = rng.integers(0, n_crime_types, n_rows)
+    district_codes = rng.integers(0, n_districts, n_rows)
+    year_codes = rng.integers(0, len(years), n_rows)
+    province_codes = district_province[district_codes]
+
+    mean = 6 + crime_effect[crime_codes] + province_effect[province_codes] + trend[year_codes]
+    cases = np.maximum(1, rng.lognormal(mean, 0.6)).astype(np.int32)
+
+    return pd.DataFrame({
+        "Crime Detail": pd.Categorical.from_codes(crime_codes, crimes),
+        "Year": years[year_codes].astype(np.int16),
+        "Province": pd.Categorical.from_codes(province_codes, provinces),
+        "Number of Cases": cases,
+        "District": pd.Categorical.from_codes(district_codes, districts),
+    })
+
+def write_crime_csv(path, n_rows, chunk_rows=1_000_000, **kwargs):
+    """Write a synthetic dataset to CSV in chunks, so 10M+ rows fit in memory."""
+    for part, start in enumerate(range(0, max(n_rows, 1), chunk_rows)):
+        chunk = generate_crime_data(min(chunk_rows, n_rows - start), part=part, **kwargs)
+        chunk.to_csv(path, mode="w" if part == 0 else "a", header=part == 0, index=False)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic crime dataset.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--provinces", type=int, default=5)
+    parser.add_argument("--districts", type=int, default=30)
+    parser.add_argument("--crime-types", type=int, default=11)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="synthetic_crime.csv")
+    args = parser.parse_args()
+
+    write_crime_csv(
+        args.out, args.rows, n_provinces=args.provinces, n_districts=args.districts,
+        n_crime_types=args.crime_types, seed=args.seed
+    )
+    print(f"✅ Wrote {args.rows:,} rows to {args.out}")
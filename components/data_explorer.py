@@ -1,5 +1,9 @@
 import streamlit as st
 import pandas as pd
+from utils.data_loader import get_filter_index, get_partition_stats
+from utils.export import EXPORT_FORMATS, available_formats, get_export
+
+PAGE_SIZES = [25, 100, 500, 1000]
 
 def render_data_explorer(df):
     """Render the raw data explorer section."""
@@ -62,44 +66,67 @@ def render_data_explorer(df):
     """, unsafe_allow_html=True)
 
     # ===== FILTER OPTIONS =====
+    filter_index = get_filter_index(df)
     col1, col2, col3 = st.columns(3)
 
     with col1:
         selected_year = st.multiselect(
             "Filter by Year:",
-            options=sorted(df["Year"].unique()),
+            options=filter_index.options("Year"),
             default=[]
         )
 
     with col2:
         selected_province = st.multiselect(
             "Filter by Province:",
-            options=sorted(df["Province"].unique()),
+            options=filter_index.options("Province"),
             default=[]
         )
 
     with col3:
         selected_crime = st.multiselect(
             "Filter by Crime Type:",
-            options=sorted(df["Crime Detail"].unique()),
+            options=filter_index.options("Crime Detail"),
             default=[]
         )
 
-    # ===== APPLY FILTERS =====
-    filtered_df = df.copy()
+    selections = {
+        "Year": selected_year,
+        "Province": selected_province,
+        "Crime Detail": selected_crime,
+    }
+
+    # ===== SORT & PAGE CONTROLS =====
+    col1, col2, col3 = st.columns(3)
 
-    if selected_year:
-        filtered_df = filtered_df[filtered_df["Year"].isin(selected_year)]
+    with col1:
+        sort_by = st.selectbox("Sort by:", options=["(dataset order)"] + list(df.columns), index=0)
+        sort_by = None if sort_by == "(dataset order)" else sort_by
 
-    if selected_province:
-        filtered_df = filtered_df[filtered_df["Province"].isin(selected_province)]
+    with col2:
+        ascending = st.radio("Order:", options=["Ascending", "Descending"], horizontal=True) == "Ascending"
 
-    if selected_crime:
-        filtered_df = filtered_df[filtered_df["Crime Detail"].isin(selected_crime)]
+    with col3:
+        page_size = st.selectbox("Rows per page:", options=PAGE_SIZES, index=1)
+
+    # Go back to the first page whenever the filters, sort or page size change
+    view = (repr(selections), sort_by, ascending, page_size)
+    if st.session_state.get("explorer_view") != view:
+        st.session_state["explorer_view"] = view
+        st.session_state["explorer_page"] = 1
+
+    # ===== DISPLAY ONE PAGE OF THE FILTERED TABLE =====
+    # Only the visible page is materialized and sent to the browser
+    total_rows = filter_index.count(selections)
+    page_count = max(1, -(-total_rows // page_size))
+    page = st.number_input(
+        f"Page (of {page_count:,}):", min_value=1, max_value=page_count, step=1, key="explorer_page"
+    )
+    offset = (int(page) - 1) * page_size
+    page_df, total_rows = filter_index.window(selections, sort_by, ascending, offset, page_size)
 
-    # ===== DISPLAY FILTERED TABLE =====
     st.dataframe(
-        filtered_df,
+        page_df,
         use_container_width=True,
         height=400,
         column_config={
@@ -108,21 +135,46 @@ def render_data_explorer(df):
         },
         hide_index=True,
     )
+    if total_rows:
+        st.caption(f"Showing rows {offset + 1:,}–{offset + len(page_df):,} of {total_rows:,}")
+    else:
+        st.caption("No rows match the selected filters")
 
     # ===== DOWNLOAD BUTTON =====
-    if not filtered_df.empty:
-        csv = filtered_df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="Download Filtered Data as CSV",
-            data=csv,
-            file_name="rwanda_crime_data_filtered.csv",
-            mime="text/csv",
-        )
+    # The export is only written when the button is clicked, then reused for the same filters
+    if total_rows:
+        col1, col2 = st.columns([1, 3], vertical_alignment="bottom")
+        with col1:
+            export_format = st.selectbox(
+                "Export format:",
+                options=available_formats(),
+                format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+            )
+        label, extension, mime = EXPORT_FORMATS[export_format]
+        data_version = df.attrs.get("data_version")
+
+        def build_export():
+            with open(get_export(filter_index, selections, export_format, data_version), "rb") as f:
+                return f.read()
+
+        with col2:
+            st.download_button(
+                label=f"Download Filtered Data as {label}",
+                data=build_export,
+                file_name=f"rwanda_crime_data_filtered{extension}",
+                mime=mime,
+            )
 
     # ===== SUMMARY STATISTICS CHECKBOX & TABLE =====
     if st.checkbox("Show Summary Statistics"):
         st.markdown("<h4 style='color:white;'>Summary Statistics</h4>", unsafe_allow_html=True)
-        numeric_cols = filtered_df.select_dtypes(include=['float64', 'int64'])
-        st.dataframe(numeric_cols.describe())
+        # Merged from precomputed partition summaries rather than rescanning the filtered rows
+        partition_stats = get_partition_stats(df)
+        st.dataframe(partition_stats.describe(selections))
+        if not partition_stats.exact:
+            st.caption(
+                f"Quartiles of columns with many distinct values are estimated "
+                f"to within {partition_stats.relative_accuracy:.1%} of the exact value."
+            )
 
     st.markdown('</div>', unsafe_allow_html=True)  # Close section container
@@ -0,0 +1,32 @@
+import streamlit as st
+import pandas as pd
+from utils.perf import summarize
+
+def render_perf_panel(model_assets):
+    """Render rolling render and cache timings; shown only with ?perf=1."""
+    st.markdown('<div class="section-container">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">⏱️ Performance</div>', unsafe_allow_html=True)
+
+    rows = summarize()
+    if rows:
+        table = pd.DataFrame(rows).set_index("name")
+        st.dataframe(
+            table.style.format({
+                "p50_ms": "{:.1f}",
+                "p95_ms": "{:.1f}",
+                "p99_ms": "{:.1f}",
+                "mean_kb_sent": "{:.1f}",
+                "cache_hit_rate": "{:.0%}",
+            }, na_rep="–"),
+            use_container_width=True
+        )
+        st.caption("Timings cover this server process; components are measured on every rerun while the panel is open.")
+    else:
+        st.info("No timings recorded yet; rerun the page to collect samples.")
+
+    # ===== Micro-batcher =====
+    batcher = model_assets.get("batcher") if model_assets else None
+    if batcher is not None:
+        st.json(batcher.stats(), expanded=False)
+
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -1,17 +1,12 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import time
+from utils.forecast import province_options
+from utils.inference import submit_inference
 
 def render_prediction(model_assets, df):
     """Render the crime prediction section."""
     if model_assets is None:
         return
     
-    model = model_assets["model"]
-    label_encoder = model_assets["label_encoder"]
-    model_features = model_assets["model_features"]
-    
     st.markdown('<div class="section-container">', unsafe_allow_html=True)
     st.markdown("""
         <div class="section-title">
@@ -45,7 +40,8 @@ def render_prediction(model_assets, df):
         with col1:
             province = st.selectbox(
                 "Select Province",
-                options=sorted(df["Province"].unique()),
+                # The model can only encode the provinces it was trained on, which may differ from the CSV
+                options=province_options(model_assets["encoder"]),
                 index=0
             )
         
@@ -72,67 +68,59 @@ def render_prediction(model_assets, df):
         submitted = st.form_submit_button("Generate Prediction")
         
         if submitted:
-            # Create progress bar for effect
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # Simulate processing
-            for i in range(101):
-                # Update progress bar
-                progress_bar.progress(i)
-                
-                # Update status text based on progress
-                if i < 30:
-                    status_text.text("Analyzing historical patterns...")
-                elif i < 60:
-                    status_text.text("Applying machine learning algorithms...")
-                elif i < 90:
-                    status_text.text("Generating prediction...")
+            # Run inference off the script thread and report the measured stages
+            with st.status("Generating prediction...") as status:
+                try:
+                    forecast, timings = submit_inference(model_assets, province, int(year)).result()
+                except ValueError as e:
+                    forecast = None
+                    status.update(label="Prediction failed", state="error")
+                    st.error(f"❌ Could not generate a prediction: {e}")
                 else:
-                    status_text.text("Finalizing results...")
-                
-                time.sleep(0.01)  # Small delay for animation effect
-            
-            # Clear status text and progress bar
-            status_text.empty()
-            progress_bar.empty()
-            
-            # Prepare input for prediction
-            input_data = pd.DataFrame([[province, year]], columns=["Province", "Year"])
-            input_encoded = pd.get_dummies(input_data)
-            input_encoded = input_encoded.reindex(columns=model_features, fill_value=0)
+                    for stage, elapsed_ms in timings.items():
+                        st.write(f"{stage.capitalize()}: {elapsed_ms:.2f} ms")
+                    status.update(
+                        label=f"Prediction ready in {sum(timings.values()):.2f} ms",
+                        state="complete",
+                        expanded=False
+                    )
             
-            # Get prediction
-            pred_label = model.predict(input_encoded)[0]
-            pred_crime = label_encoder.inverse_transform([pred_label])[0]
+            if forecast is not None:
+                pred_crime = forecast["crime"]
+                alternatives = "".join(
+                    f"<li>{crime}: {probability:.0%}</li>" for crime, probability in forecast["probabilities"]
+                )
             
-            # Display prediction with animation effect
-            st.markdown(f"""
-                <div class="prediction-result">
-                    <h3 style="margin-top: 0; margin-bottom: 5px;">Prediction Result</h3>
-                    <p style="font-size: 0.9rem; margin-bottom: 10px;">Based on the selected parameters:</p>
-                    <div style="font-size: 1.4rem; font-weight: 600; margin-bottom: 5px;">
-                        Most likely crime type in {province} for {year}:
+                # Display prediction with animation effect
+                st.markdown(f"""
+                    <div class="prediction-result">
+                        <h3 style="margin-top: 0; margin-bottom: 5px;">Prediction Result</h3>
+                        <p style="font-size: 0.9rem; margin-bottom: 10px;">Based on the selected parameters:</p>
+                        <div style="font-size: 1.4rem; font-weight: 600; margin-bottom: 5px;">
+                            Most likely crime type in {province} for {year}:
+                        </div>
+                        <div style="font-size: 2rem; font-weight: 700; margin: 15px 0;">
+                            {pred_crime}
+                        </div>
+                        <ul style="display: inline-block; text-align: left; font-size: 0.9rem; margin: 0 0 10px 0;">
+                            {alternatives}
+                        </ul>
+                        <div style="font-size: 0.85rem; opacity: 0.8;">
+                            Model confidence: {confidence}%
+                        </div>
                     </div>
-                    <div style="font-size: 2rem; font-weight: 700; margin: 15px 0;">
-                        {pred_crime}
-                    </div>
-                    <div style="font-size: 0.85rem; opacity: 0.8;">
-                        Model confidence: {confidence}%
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+                """, unsafe_allow_html=True)
             
-            # Add interpretation
-            st.markdown("""
-                <div style="background: rgba(0,50,100,0.5); padding: 15px; border-radius: 8px; margin-top: 20px;">
-                    <h4 style="margin-top: 0; color: #FFD700; font-size: 1.1rem;">Interpretation & Action Points:</h4>
-                    <ul style="margin-bottom: 0;">
-                        <li>This prediction is based on historical patterns and may not account for recent policy changes</li>
-                        <li>Consider preventive measures targeted at this specific crime type</li>
-                        <li>Allocate resources appropriately based on this forecast</li>
-                    </ul>
-                </div>
-            """, unsafe_allow_html=True)
+                # Add interpretation
+                st.markdown("""
+                    <div style="background: rgba(0,50,100,0.5); padding: 15px; border-radius: 8px; margin-top: 20px;">
+                        <h4 style="margin-top: 0; color: #FFD700; font-size: 1.1rem;">Interpretation & Action Points:</h4>
+                        <ul style="margin-bottom: 0;">
+                            <li>This prediction is based on historical patterns and may not account for recent policy changes</li>
+                            <li>Consider preventive measures targeted at this specific crime type</li>
+                            <li>Allocate resources appropriately based on this forecast</li>
+                        </ul>
+                    </div>
+                """, unsafe_allow_html=True)
     
     st.markdown('</div>', unsafe_allow_html=True)  # Close section container
\ No newline at end of file
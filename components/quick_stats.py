@@ -1,20 +1,32 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import os
 from datetime import datetime
+from utils.data_loader import get_aggregate_cube
+from utils.inference import get_executor
+from utils.perf import cached
+from utils.sketches import Z_95, HyperLogLog, heavy_hitters, sample_positions
+
+APPROX_STATS_ENV = "CRIME_DASHBOARD_APPROX_STATS"
+# Rows sampled for the approximate top province
+APPROX_SAMPLE_ROWS = 200_000
+EXACT_STATS_POLL_SECONDS = 1
 
 def get_stats(df):
     """Calculate statistics from the dataset."""
-    total_crimes = df['Number of Cases'].sum()
-    unique_crimes = df["Crime Detail"].nunique()
-    provinces = df["Province"].nunique() 
+    cube = get_aggregate_cube(df)
+    total_crimes = cube.total
+    unique_crimes = len(cube.by_crime)
+    provinces = len(cube.by_province)
     
     # Find the province with most crimes
-    province_crimes = df.groupby("Province")["Number of Cases"].sum()
+    province_crimes = cube.by_province
     highest_crime_province = province_crimes.idxmax()
     highest_crime_count = province_crimes.max()
     
     # Get the most recent year in the dataset
-    latest_year = df["Year"].max()
+    latest_year = cube.by_year.index.max()
     
     return {
         "total_crimes": total_crimes,
@@ -25,22 +37,72 @@ def get_stats(df):
         "latest_year": latest_year
     }
 
-def render_quick_stats(df):
-    """Render the quick statistics section."""
-    stats = get_stats(df)
-    
-    st.markdown('<div class="section-container">', unsafe_allow_html=True)
-    st.markdown("""
-        <div class="section-title">
-            <svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-bar-chart-3">
-                <path d="M3 3v18h18"></path>
-                <path d="M18 17V9"></path>
-                <path d="M13 17V5"></path>
-                <path d="M8 17v-3"></path>
-            </svg>
-            Key Crime Statistics
-        </div>
-    """, unsafe_allow_html=True)
+def approximate_mode():
+    """Whether quick stats start from sketches; opt in with CRIME_DASHBOARD_APPROX_STATS=1."""
+    return os.environ.get(APPROX_STATS_ENV) == "1"
+
+def compute_approximate_stats(df, sample_rows=APPROX_SAMPLE_ROWS):
+    """Estimate the quick stats without grouping the full dataset.
+
+    The top province comes from a uniform row sample with a 95% error bound.
+    Distinct counts of categorical columns are exact from their codes; other
+    columns fall back to a HyperLogLog sketch. The total and latest year are
+    single vectorized reductions and stay exact.
+    """
+    n_rows = len(df)
+    positions = sample_positions(n_rows, sample_rows)
+    columns = df[["Province", "Number of Cases"]]
+    sample = columns if positions is None else columns.take(positions)
+    # Categorical keys group by code rather than by string
+    top = heavy_hitters(sample["Province"].array, sample["Number of Cases"].to_numpy(), n_rows, top=1)
+
+    stats = {
+        "total_crimes": int(df["Number of Cases"].sum()),
+        "highest_crime_province": top.index[0],
+        "highest_crime_count": int(round(top["estimate"].iloc[0])),
+        "highest_crime_count_bound": int(np.ceil(top["bound"].iloc[0])),
+        "latest_year": df["Year"].max(),
+        "approximate": True,
+    }
+    stats["unique_crimes"], stats["unique_crimes_bound"] = _distinct_count(df["Crime Detail"])
+    stats["provinces"], stats["provinces_bound"] = _distinct_count(df["Province"])
+    return stats
+
+def _distinct_count(column):
+    """Distinct non-null values and the ± 95% bound of the count (0 when exact)."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Shift codes by one so missing values (-1) land in a bin that is then dropped
+        used = np.bincount(column.cat.codes.to_numpy() + 1, minlength=len(column.cat.categories) + 1)
+        return int(np.count_nonzero(used[1:])), 0
+    sketch = HyperLogLog().add(column.dropna())
+    estimate = sketch.estimate()
+    return int(round(estimate)), int(np.ceil(Z_95 * sketch.relative_error * estimate))
+
+@cached("approximate_stats", st.cache_resource(max_entries=4))
+def _build_approximate_stats(data_version, _df):
+    return compute_approximate_stats(_df)
+
+@st.cache_resource(max_entries=4)
+def _exact_stats_job(data_version, _df):
+    # One background computation per data version, shared by every session
+    return get_executor().submit(get_stats, _df)
+
+@st.fragment(run_every=EXACT_STATS_POLL_SECONDS)
+def _render_pending_stats(df, job):
+    if job.done():
+        # Rerun the page so the exact values, or the failure, render outside this polling fragment
+        st.rerun()
+    render_stat_cards(_build_approximate_stats(df.attrs["data_version"], df))
+    st.caption("≈ Estimated values; exact figures will appear when ready.")
+
+def _bound(stats, name):
+    """The ± 95% error bound of an approximate statistic, or nothing for exact ones."""
+    bound = stats.get(f"{name}_bound")
+    return f" (± {bound:,})" if bound else ""
+
+def render_stat_cards(stats):
+    """Render the four stat cards; approximate values are marked with ≈ and their bound."""
+    approx = "≈ " if stats.get("approximate") else ""
     
     # Layout for stat cards
     col1, col2, col3, col4 = st.columns(4)
@@ -58,8 +120,8 @@ def render_quick_stats(df):
         st.markdown(f"""
             <div class="stat-card">
                 <div class="stat-label">Crime Categories</div>
-                <div class="stat-value">{stats["unique_crimes"]}</div>
-                <div style="color: #a3c2e3; font-size: 0.9rem;">Unique crime types</div>
+                <div class="stat-value">{approx}{stats["unique_crimes"]}</div>
+                <div style="color: #a3c2e3; font-size: 0.9rem;">Unique crime types{_bound(stats, "unique_crimes")}</div>
             </div>
         """, unsafe_allow_html=True)
     
@@ -67,8 +129,8 @@ def render_quick_stats(df):
         st.markdown(f"""
             <div class="stat-card">
                 <div class="stat-label">Provinces Monitored</div>
-                <div class="stat-value">{stats["provinces"]}</div>
-                <div style="color: #a3c2e3; font-size: 0.9rem;">Geographic regions</div>
+                <div class="stat-value">{approx}{stats["provinces"]}</div>
+                <div style="color: #a3c2e3; font-size: 0.9rem;">Geographic regions{_bound(stats, "provinces")}</div>
             </div>
         """, unsafe_allow_html=True)
     
@@ -77,8 +139,36 @@ def render_quick_stats(df):
             <div class="stat-card">
                 <div class="stat-label">Highest Crime Area</div>
                 <div class="stat-value" style="font-size: 1.5rem;">{stats["highest_crime_province"]}</div>
-                <div style="color: #a3c2e3; font-size: 0.9rem;">{stats["highest_crime_count"]:,} reported cases</div>
+                <div style="color: #a3c2e3; font-size: 0.9rem;">{approx}{stats["highest_crime_count"]:,}{_bound(stats, "highest_crime_count")} reported cases</div>
             </div>
         """, unsafe_allow_html=True)
+
+def render_quick_stats(df):
+    """Render the quick statistics section."""
+    st.markdown('<div class="section-container">', unsafe_allow_html=True)
+    st.markdown("""
+        <div class="section-title">
+            <svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-bar-chart-3">
+                <path d="M3 3v18h18"></path>
+                <path d="M18 17V9"></path>
+                <path d="M13 17V5"></path>
+                <path d="M8 17v-3"></path>
+            </svg>
+            Key Crime Statistics
+        </div>
+    """, unsafe_allow_html=True)
+    
+    if not approximate_mode() or df.attrs.get("data_version") is None:
+        render_stat_cards(get_stats(df))
+    else:
+        # Show sketch-based estimates at once and swap in the exact values once computed
+        job = _exact_stats_job(df.attrs["data_version"], df)
+        if not job.done():
+            _render_pending_stats(df, job)
+        elif job.exception() is None:
+            render_stat_cards(job.result())
+        else:
+            render_stat_cards(_build_approximate_stats(df.attrs["data_version"], df))
+            st.caption(f"⚠️ Exact statistics could not be computed: {job.exception()}")
         
     st.markdown('</div>', unsafe_allow_html=True)  # Close section container
\ No newline at end of file
@@ -3,11 +3,22 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
+from utils.case_forecast import case_matrix
+from utils.data_loader import get_aggregate_cube, get_case_forecast, per_data_version
+from utils.timeseries import DATE_COLUMN, MAX_POINTS, daily_series, extremes, resolve_series
+
+VIZ_TAB_KEY = "viz_tab"
+VIZ_TABS = ["📊 Crime Types", "📈 Time Trends", "🗺️ Geographic Distribution"]
+# Time trend points are drawn with markers only up to this many
+MARKER_POINTS = 100
+# Series drawn on the case forecast chart, by expected cases next year
+FORECAST_SERIES = 5
+FORECAST_COLORS = ["#FFD700", "#4DA6FF", "#FF6666", "#66FFB2", "#C39BD3"]
 
 def create_crime_type_chart(df):
     """Create the crime type distribution chart."""
     # Get top 10 crime types
-    crime_counts = df.groupby("Crime Detail")["Number of Cases"].sum().reset_index()
+    crime_counts = get_aggregate_cube(df).by_crime.reset_index()
     crime_counts = crime_counts.sort_values("Number of Cases", ascending=False).head(10)
     
     # Custom color scale
@@ -44,40 +55,37 @@ def create_crime_type_chart(df):
     
     return fig
 
-def create_time_trend_chart(df):
+def create_time_trend_chart(df, max_points=MAX_POINTS):
     """Create the crime over time chart."""
-    crime_over_time = df.groupby("Year")["Number of Cases"].sum().reset_index()
+    # Daily records are summed per day and thinned with LTTB to fit the chart; yearly data is plotted as is
+    if DATE_COLUMN in df.columns:
+        full_series = daily_series(df)
+    else:
+        full_series = get_aggregate_cube(df).by_year
+    crime_over_time, resolution = resolve_series(full_series, max_points)
     
     fig = go.Figure()
     
-    # Add main line
+    # Add main line with the shaded area under it as a single trace
     fig.add_trace(go.Scatter(
-        x=crime_over_time["Year"],
-        y=crime_over_time["Number of Cases"],
-        mode="lines+markers",
-        line=dict(color="#FFD700", width=4),
+        x=crime_over_time.index,
+        y=crime_over_time.to_numpy(),
+        mode="lines+markers" if len(crime_over_time) <= MARKER_POINTS else "lines",
+        line=dict(color="#FFD700", width=4 if len(crime_over_time) <= MARKER_POINTS else 2),
         marker=dict(size=10, color="#FFD700", line=dict(width=2, color="#000000")),
-        name="Total Cases"
-    ))
-    
-    # Add shaded area under the line
-    fig.add_trace(go.Scatter(
-        x=crime_over_time["Year"],
-        y=crime_over_time["Number of Cases"],
         fill="tozeroy",
         fillcolor="rgba(255, 215, 0, 0.2)",
-        line=dict(width=0),
-        showlegend=False
+        name="Total Cases"
     ))
     
     fig.update_layout(
-        title="Crime Trend Over Years",
+        title="Crime Trend Over Years" if resolution is None else f"Crime Trend by {resolution.title()}",
         template="plotly_dark",
         plot_bgcolor="rgba(0,0,0,0)",
         paper_bgcolor="rgba(0,0,0,0)",
         margin=dict(l=10, r=10, t=50, b=10),
         title_font=dict(size=20, color="#FFFFFF"),
-        xaxis_title="Year",
+        xaxis_title="Year" if resolution is None else "Date",
         yaxis_title="Number of Cases",
         xaxis=dict(showgrid=False),
         yaxis=dict(showgrid=True, gridcolor="rgba(255,255,255,0.1)"),
@@ -85,41 +93,92 @@ def create_time_trend_chart(df):
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
     )
     
-    # Add annotations for highest and lowest points
-    highest_point = crime_over_time.loc[crime_over_time["Number of Cases"].idxmax()]
-    lowest_point = crime_over_time.loc[crime_over_time["Number of Cases"].idxmin()]
-    
-    fig.add_annotation(
-        x=highest_point["Year"],
-        y=highest_point["Number of Cases"],
-        text=f"Peak: {int(highest_point['Number of Cases']):,}",
-        showarrow=True,
-        arrowhead=2,
-        arrowcolor="#FFD700",
-        arrowsize=1,
-        arrowwidth=2,
-        ax=40,
-        ay=-40
-    )
+    # Add annotations for highest and lowest points at their full-resolution values;
+    # LTTB always keeps both points, so the arrows land on the daily line
+    for (when, cases), label, offset in zip(extremes(full_series), ["Peak", "Low"], [(40, -40), (-40, 40)]):
+        text = f"{label}: {int(cases):,}"
+        if resolution is not None:
+            text += f" ({when:%Y-%m-%d})"
+        fig.add_annotation(
+            x=when,
+            y=cases,
+            text=text,
+            showarrow=True,
+            arrowhead=2,
+            arrowcolor="#FFD700",
+            arrowsize=1,
+            arrowwidth=2,
+            ax=offset[0],
+            ay=offset[1]
+        )
     
-    fig.add_annotation(
-        x=lowest_point["Year"],
-        y=lowest_point["Number of Cases"],
-        text=f"Low: {int(lowest_point['Number of Cases']):,}",
-        showarrow=True,
-        arrowhead=2,
-        arrowcolor="#FFD700",
-        arrowsize=1,
-        arrowwidth=2,
-        ax=-40,
-        ay=40
+    return fig
+
+def create_case_forecast_chart(df, top=FORECAST_SERIES):
+    """Create the expected cases chart for the series with the most cases forecast next year."""
+    forecast = get_case_forecast(df)
+    index, years, history = case_matrix(get_aggregate_cube(df).cells)
+    next_year = forecast.xs(years[-1] + 1, level="Year")["forecast"]
+    top_series = next_year.sort_values(ascending=False).index[:top]
+    rows = index.get_indexer(top_series)
+
+    fig = go.Figure()
+
+    for (province, crime), row, color in zip(top_series, rows, FORECAST_COLORS * (top // len(FORECAST_COLORS) + 1)):
+        name = f"{crime} ({province})"
+        series = forecast.loc[(province, crime)]
+        red, green, blue = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+        # 95% interval as one closed band, then the observed and forecast lines
+        fig.add_trace(go.Scatter(
+            x=list(series.index) + list(series.index[::-1]),
+            y=list(series["upper"]) + list(series["lower"][::-1]),
+            fill="toself",
+            fillcolor=f"rgba({red}, {green}, {blue}, 0.15)",
+            line=dict(width=0),
+            hoverinfo="skip",
+            showlegend=False,
+            legendgroup=name,
+        ))
+        fig.add_trace(go.Scatter(
+            x=years,
+            y=history[row],
+            mode="lines+markers",
+            line=dict(color=color, width=3),
+            name=name,
+            legendgroup=name,
+            hovertemplate=f"<b>{name}</b><br>%{{x}}: %{{y:,}} cases<extra></extra>",
+        ))
+        fig.add_trace(go.Scatter(
+            x=[years[-1]] + list(series.index),
+            y=[history[row][-1]] + list(series["forecast"]),
+            mode="lines+markers",
+            line=dict(color=color, width=3, dash="dash"),
+            showlegend=False,
+            legendgroup=name,
+            hovertemplate=f"<b>{name}</b><br>%{{x}}: %{{y:,.0f}} expected<extra></extra>",
+        ))
+
+    fig.update_layout(
+        title="Expected Cases by Province and Crime Type",
+        template="plotly_dark",
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        margin=dict(l=10, r=10, t=50, b=10),
+        title_font=dict(size=20, color="#FFFFFF"),
+        xaxis_title="Year",
+        yaxis_title="Number of Cases",
+        xaxis=dict(showgrid=False, dtick=1),
+        yaxis=dict(showgrid=True, gridcolor="rgba(255,255,255,0.1)"),
+        hoverlabel=dict(bgcolor="rgba(0,30,60,0.8)", font_size=12),
+        legend=dict(orientation="h", yanchor="top", y=-0.15, xanchor="left", x=0)
     )
-    
+
     return fig
 
 def create_province_chart(df):
     """Create the province distribution chart."""
-    crime_by_province = df.groupby("Province")["Number of Cases"].sum().reset_index()
+    crime_by_province = get_aggregate_cube(df).by_province.reset_index()
     crime_by_province = crime_by_province.sort_values("Number of Cases", ascending=True)
     
     colors = ["#001F3F", "#003366", "#004080", "#0059B3", "#0073E6", "#1A8CFF", "#4DA6FF", "#80BFFF"]
@@ -129,6 +188,10 @@ def create_province_chart(df):
     
     colors = colors[:len(crime_by_province)]
     
+    # Percentage labels are drawn as the bars' own text rather than one annotation per province
+    total_cases = crime_by_province["Number of Cases"].sum()
+    percentages = crime_by_province["Number of Cases"] / total_cases * 100
+    
     fig = go.Figure()
     
     # Add horizontal bars
@@ -140,28 +203,13 @@ def create_province_chart(df):
             color=colors,
             line=dict(width=0)
         ),
+        text=percentages.map("{:.1f}%".format),
+        textposition="outside",
+        textfont=dict(color="white", size=12),
+        cliponaxis=False,
         hovertemplate="<b>%{y}</b><br>Cases: %{x:,}<extra></extra>"
     ))
     
-    # Add percentage labels
-    total_cases = crime_by_province["Number of Cases"].sum()
-    percentages = crime_by_province["Number of Cases"] / total_cases * 100
-    
-    for i, (province, cases, percentage) in enumerate(zip(
-        crime_by_province["Province"],
-        crime_by_province["Number of Cases"],
-        percentages
-    )):
-        fig.add_annotation(
-            x=cases,
-            y=province,
-            text=f"{percentage:.1f}%",
-            showarrow=False,
-            xanchor="left",
-            xshift=10,
-            font=dict(color="white", size=12)
-        )
-    
     fig.update_layout(
         title="Crime Distribution by Province",
         template="plotly_dark",
@@ -178,6 +226,18 @@ def create_province_chart(df):
     
     return fig
 
+CHART_BUILDERS = {
+    "crime_type": create_crime_type_chart,
+    "time_trend": create_time_trend_chart,
+    "case_forecast": create_case_forecast_chart,
+    "province": create_province_chart,
+}
+
+@per_data_version("chart_figure", variants=len(CHART_BUILDERS))
+def get_chart(df, chart):
+    """Return a chart's figure for a dataset, built once per data version."""
+    return CHART_BUILDERS[chart](df)
+
 def render_visualizations(df):
     """Render the visualization section with charts."""
     st.markdown('<div class="section-container">', unsafe_allow_html=True)
@@ -193,55 +253,79 @@ def render_visualizations(df):
         </div>
     """, unsafe_allow_html=True)
     
-    # Create tabs for different visualizations
-    viz_tabs = st.tabs(["📊 Crime Types", "📈 Time Trends", "🗺️ Geographic Distribution"])
+    # Create tabs for different visualizations; only the open tab runs and is sent to the browser
+    viz_tabs = st.tabs(VIZ_TABS, key=VIZ_TAB_KEY, on_change="rerun")
     
-    with viz_tabs[0]:
-        crime_type_fig = create_crime_type_chart(df)
-        st.plotly_chart(crime_type_fig, use_container_width=True)
+    if viz_tabs[0].open:
+        with viz_tabs[0]:
+            crime_type_fig = get_chart(df, "crime_type")
+            st.plotly_chart(crime_type_fig, use_container_width=True)
         
-        # Add analysis
-        st.markdown("""
-            <div style="background: rgba(0,40,80,0.5); padding: 15px; border-radius: 8px; margin-top: 15px;">
-                <h4 style="margin-top: 0; color: #FFD700;">Key Insights:</h4>
-                <ul style="margin-bottom: 0;">
-                    <li>Certain crime types consistently appear more frequently in reports</li>
-                    <li>Understanding the most common crimes helps in prioritizing preventive measures</li>
-                    <li>Specialized enforcement teams may be needed for specific high-frequency crimes</li>
-                </ul>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with viz_tabs[1]:
-        time_trend_fig = create_time_trend_chart(df)
-        st.plotly_chart(time_trend_fig, use_container_width=True)
+            # Add analysis
+            st.markdown("""
+                <div style="background: rgba(0,40,80,0.5); padding: 15px; border-radius: 8px; margin-top: 15px;">
+                    <h4 style="margin-top: 0; color: #FFD700;">Key Insights:</h4>
+                    <ul style="margin-bottom: 0;">
+                        <li>Certain crime types consistently appear more frequently in reports</li>
+                        <li>Understanding the most common crimes helps in prioritizing preventive measures</li>
+                        <li>Specialized enforcement teams may be needed for specific high-frequency crimes</li>
+                    </ul>
+                </div>
+            """, unsafe_allow_html=True)
+    
+    if viz_tabs[1].open:
+        with viz_tabs[1]:
+            time_trend_fig = get_chart(df, "time_trend")
+            st.plotly_chart(time_trend_fig, use_container_width=True)
         
-        # Add analysis
-        st.markdown("""
-            <div style="background: rgba(0,40,80,0.5); padding: 15px; border-radius: 8px; margin-top: 15px;">
-                <h4 style="margin-top: 0; color: #FFD700;">Trend Analysis:</h4>
-                <ul style="margin-bottom: 0;">
-                    <li>The chart reveals crime patterns over time, showing peaks and valleys</li>
-                    <li>Year-over-year changes may correlate with policy implementations or socioeconomic factors</li>
-                    <li>Understanding seasonal or annual patterns helps in resource allocation</li>
-                </ul>
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with viz_tabs[2]:
-        province_fig = create_province_chart(df)
-        st.plotly_chart(province_fig, use_container_width=True)
+            # Add analysis
+            st.markdown("""
+                <div style="background: rgba(0,40,80,0.5); padding: 15px; border-radius: 8px; margin-top: 15px;">
+                    <h4 style="margin-top: 0; color: #FFD700;">Trend Analysis:</h4>
+                    <ul style="margin-bottom: 0;">
+                        <li>The chart reveals crime patterns over time, showing peaks and valleys</li>
+                        <li>Year-over-year changes may correlate with policy implementations or socioeconomic factors</li>
+                        <li>Understanding seasonal or annual patterns helps in resource allocation</li>
+                    </ul>
+                </div>
+            """, unsafe_allow_html=True)
+
+            # Forecasts need a few years of history; filtered or very short datasets skip them
+            try:
+                case_forecast_fig = get_chart(df, "case_forecast")
+            except ValueError as e:
+                st.info(f"Case forecasts are unavailable: {e}")
+            else:
+                st.plotly_chart(case_forecast_fig, use_container_width=True)
+                with st.expander("Expected cases for every province and crime type"):
+                    table = get_case_forecast(df)[["forecast", "lower", "upper"]].reset_index()
+                    st.dataframe(
+                        table,
+                        hide_index=True,
+                        column_config={
+                            "Year": st.column_config.NumberColumn("Year", format="%d"),
+                            "forecast": st.column_config.NumberColumn("Expected cases", format="%d"),
+                            "lower": st.column_config.NumberColumn("95% low", format="%d"),
+                            "upper": st.column_config.NumberColumn("95% high", format="%d"),
+                        },
+                    )
+                    st.caption("Holt trend smoothing fitted per series; intervals widen with each year ahead.")
+    
+    if viz_tabs[2].open:
+        with viz_tabs[2]:
+            province_fig = get_chart(df, "province")
+            st.plotly_chart(province_fig, use_container_width=True)
         
-        # Add analysis
-        st.markdown("""
-            <div style="background: rgba(0,40,80,0.5); padding: 15px; border-radius: 8px; margin-top: 15px;">
-                <h4 style="margin-top: 0; color: #FFD700;">Regional Insights:</h4>
-                <ul style="margin-bottom: 0;">
-                    <li>Crime distribution varies significantly by province</li>
-                    <li>Population density and urbanization may correlate with higher crime rates</li>
-                    <li>Regional differences suggest the need for tailored prevention strategies</li>
-                </ul>
-            </div>
-        """, unsafe_allow_html=True)
+            # Add analysis
+            st.markdown("""
+                <div style="background: rgba(0,40,80,0.5); padding: 15px; border-radius: 8px; margin-top: 15px;">
+                    <h4 style="margin-top: 0; color: #FFD700;">Regional Insights:</h4>
+                    <ul style="margin-bottom: 0;">
+                        <li>Crime distribution varies significantly by province</li>
+                        <li>Population density and urbanization may correlate with higher crime rates</li>
+                        <li>Regional differences suggest the need for tailored prevention strategies</li>
+                    </ul>
+                </div>
+            """, unsafe_allow_html=True)
     
     st.markdown('</div>', unsafe_allow_html=True)  # Close section container
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""Headless batch prediction service backed by the dashboard's model assets.
+
+Run locally with:
+
+    python prediction_service.py --port 8000
+
+Endpoints:
+    GET  /healthz   liveness; always 200 while the process is up
+    GET  /readyz    200 once the model is loaded, 503 before (or on failure)
+    GET  /metrics   micro-batcher batch-size and queue-wait histograms
+    POST /predict   {"scenarios": [{"province": "Eastern", "year": 2025}, ...], "top_k": 3}
+"""
+import argparse
+import asyncio
+import json
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+from utils.forecast import FORECAST_YEARS, TOP_K, decode_classes, province_options
+from utils.inference import get_executor, load_compact_forest, make_batcher, make_process_scorer, predict_proba
+from utils.model_bundle import load_model_artifacts
+
+logger = logging.getLogger(__name__)
+
+MAX_SCENARIOS = 10_000
+RESULT_CACHE_SIZE = 100_000
+MAX_BODY_BYTES = 4 * 1024 * 1024
+# Years a scenario may ask about; anything outside is a client error rather than a float overflow
+MIN_YEAR, MAX_YEAR = 1900, 2100
+
+class RequestTooLarge(ValueError):
+    """The request body is over MAX_BODY_BYTES."""
+
+class ResultCache:
+    """Thread-safe LRU of probability rows keyed by (province, year)."""
+
+    def __init__(self, max_size=RESULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        with self._lock:
+            found = {}
+            for key in keys:
+                row = self._rows.get(key)
+                if row is not None:
+                    self._rows.move_to_end(key)
+                    found[key] = row
+            return found
+
+    def put_many(self, keys, rows):
+        with self._lock:
+            for key, row in zip(keys, rows):
+                self._rows[key] = row
+                self._rows.move_to_end(key)
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+
+    def __len__(self):
+        return len(self._rows)
+
+class PredictionService:
+    """Loads the model once and scores batches of (Province, Year) scenarios."""
+
+    def __init__(self, loader=load_model_artifacts):
+        self.loader = loader
+        self.assets = None
+        self.error = None
+        self.cache = ResultCache()
+        self._loading = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Begin loading the model in the background; safe to call more than once."""
+        with self._lock:
+            if self._loading is None:
+                self._loading = threading.Thread(target=self._load, name="model-loader", daemon=True)
+                self._loading.start()
+
+    def _load(self):
+        try:
+            assets = self.loader()
+            assets["class_names"] = decode_classes(assets["model"], assets["label_encoder"])
+            assets["provinces"] = set(province_options(assets["encoder"]))
+            assets["compact_forest"] = load_compact_forest(assets)
+            assets["process_scorer"] = make_process_scorer(assets)
+            assets["batcher"] = make_batcher(assets)
+
+            # Warm the cache with the same grid the dashboard precomputes
+            grid = [(province, int(year)) for province in sorted(assets["provinces"]) for year in FORECAST_YEARS]
+            self._score(assets, grid)
+            self.assets = assets
+            logger.info("Model %s ready", assets["model_version"][:12])
+        except Exception as e:
+            self.error = str(e)
+            logger.exception("Model loading failed")
+
+    @property
+    def ready(self):
+        return self.assets is not None
+
+    def _score(self, assets, keys):
+        X = assets["encoder"].encode([p for p, _ in keys], [y for _, y in keys])
+        proba = predict_proba(assets, X)
+        self.cache.put_many(keys, proba)
+        return dict(zip(keys, proba))
+
+    def predict(self, scenarios, top_k=TOP_K):
+        """Score a batch of scenarios, returning one result per scenario in order."""
+        assets = self.assets
+        keys = []
+        unknown = set()
+        for scenario in scenarios:
+            province, year = scenario["province"], int(scenario["year"])
+            if province not in assets["provinces"]:
+                unknown.add(province)
+            keys.append((province, year))
+        if unknown:
+            raise ValueError(f"Unknown provinces: {sorted(unknown)}")
+
+        rows = self.cache.get_many(keys)
+        misses = list(dict.fromkeys(key for key in keys if key not in rows))
+        if misses:
+            rows.update(self._score(assets, misses))
+
+        class_names = list(assets["class_names"])
+        proba = np.stack([rows[key] for key in keys]) if keys else np.empty((0, len(class_names)))
+        top = np.argsort(-proba, axis=1, kind="stable")[:, :top_k]
+        top_proba = np.take_along_axis(proba, top, axis=1).tolist()
+        return [
+            {
+                "province": province,
+                "year": year,
+                "crime": class_names[row[0]],
+                "probabilities": {class_names[j]: p for j, p in zip(row, probabilities)},
+            }
+            for (province, year), row, probabilities in zip(keys, top.tolist(), top_proba)
+        ]
+
+def _parse_predict_request(body):
+    """Validate a /predict body, returning (scenarios, top_k) or raising ValueError."""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValueError("Request body must be valid JSON")
+
+    scenarios = payload.get("scenarios") if isinstance(payload, dict) else None
+    if not isinstance(scenarios, list):
+        raise ValueError("'scenarios' must be a list")
+    if len(scenarios) > MAX_SCENARIOS:
+        raise ValueError(f"At most {MAX_SCENARIOS:,} scenarios per request")
+    for scenario in scenarios:
+        if not isinstance(scenario, dict) or "province" not in scenario or "year" not in scenario:
+            raise ValueError("Each scenario needs 'province' and 'year'")
+        if not isinstance(scenario["province"], str):
+            raise ValueError("'province' must be a string")
+        if not isinstance(scenario["year"], int) or isinstance(scenario["year"], bool):
+            raise ValueError("'year' must be an integer")
+        if not MIN_YEAR <= scenario["year"] <= MAX_YEAR:
+            raise ValueError(f"'year' must be between {MIN_YEAR} and {MAX_YEAR}")
+
+    top_k = payload.get("top_k", TOP_K)
+    if not isinstance(top_k, int) or top_k < 1:
+        raise ValueError("'top_k' must be a positive integer")
+    return scenarios, top_k
+
+def create_app(service=None):
+    """Build the ASGI application around a PredictionService."""
+    service = service or PredictionService()
+
+    async def send_json(send, status, payload):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def read_body(receive):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                raise RequestTooLarge(f"Request body is over {MAX_BODY_BYTES:,} bytes")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                service.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            await lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        service.start()
+        route = (scope["method"], scope["path"])
+
+        if route == ("GET", "/healthz"):
+            await send_json(send, 200, {"status": "ok"})
+        elif route == ("GET", "/readyz"):
+            if service.ready:
+                await send_json(send, 200, {
+                    "status": "ready",
+                    "model_version": service.assets["model_version"],
+                    "cached_results": len(service.cache),
+                })
+            else:
+                await send_json(send, 503, {"status": "failed" if service.error else "loading", "error": service.error})
+        elif route == ("GET", "/metrics"):
+            if not service.ready:
+                await send_json(send, 503, {"error": service.error or "Model is still loading"})
+                return
+            await send_json(send, 200, service.assets["batcher"].stats())
+        elif route == ("POST", "/predict"):
+            if not service.ready:
+                await send_json(send, 503, {"error": service.error or "Model is still loading"})
+                return
+            try:
+                scenarios, top_k = _parse_predict_request(await read_body(receive))
+                loop = asyncio.get_running_loop()
+                predictions = await loop.run_in_executor(get_executor(), service.predict, scenarios, top_k)
+            except RequestTooLarge as e:
+                await send_json(send, 413, {"error": str(e)})
+                return
+            except ValueError as e:
+                await send_json(send, 422, {"error": str(e)})
+                return
+            await send_json(send, 200, {"model_version": service.assets["model_version"], "predictions": predictions})
+        else:
+            await send_json(send, 404, {"error": "Not found"})
+
+    app.service = service
+    return app
+
+app = create_app()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve crime predictions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("The prediction service needs uvicorn: pip install uvicorn")
+
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from train_model import grow_forest
+from utils.compact_forest import CompactForest, verify_forest
+
+def _data(n_rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({
+        "Year": rng.integers(2015, 2031, n_rows).astype(float),
+        "Province_A": rng.integers(0, 2, n_rows).astype(float),
+        "Province_B": rng.integers(0, 2, n_rows).astype(float),
+        "Score": rng.normal(size=n_rows),
+    })
+    y = (X["Year"] % 4 + 2 * X["Province_A"] + (X["Score"] > 0)).astype(int).to_numpy()
+    return X, y
+
+@pytest.mark.parametrize("params", [{}, {"max_depth": 3}, {"min_samples_leaf": 5, "class_weight": "balanced"}])
+def test_matches_sklearn(params):
+    X, y = _data()
+    model = RandomForestClassifier(n_estimators=25, random_state=0, **params).fit(X, y)
+    forest = CompactForest.from_model(model)
+    X_test, _ = _data(200, seed=1)
+
+    np.testing.assert_array_equal(forest.classes_, model.classes_)
+    assert np.allclose(forest.predict_proba(X_test.to_numpy()), model.predict_proba(X_test), rtol=0, atol=1e-12)
+    assert verify_forest(forest, model, X_test.to_numpy())
+
+def test_matches_sklearn_after_grow_forest():
+    X, y = _data()
+    model = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+    # New trees see only some of the classes and are re-indexed onto the forest's
+    X_new, y_new = _data(150, seed=2)
+    keep = y_new < 4
+    grow_forest(model, X_new[keep], y_new[keep], n_trees=5)
+    assert model.n_estimators == 25
+
+    forest = CompactForest.from_model(model)
+    X_test, _ = _data(200, seed=3)
+    assert np.allclose(forest.predict_proba(X_test.to_numpy()), model.predict_proba(X_test), rtol=0, atol=1e-12)
+
+def test_arrays_round_trip_and_chunked_average(monkeypatch):
+    X, y = _data()
+    model = RandomForestClassifier(n_estimators=30, random_state=0).fit(X, y)
+    forest = CompactForest.from_arrays(CompactForest.from_model(model).to_arrays())
+    X_test, _ = _data(100, seed=4)
+    expected = model.predict_proba(X_test)
+
+    # Force one tree per chunk so the accumulation path is exercised
+    monkeypatch.setattr("utils.compact_forest.LEAF_VALUE_CHUNK", 1)
+    assert np.allclose(forest.predict_proba(X_test.to_numpy()), expected, rtol=0, atol=1e-12)
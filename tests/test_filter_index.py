@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.filter_index import FilterIndex
+
+PROVINCES = ["Eastern", "Kigali City", "Northern", "Southern", "Western"]
+CRIMES = ["Assault", "Burglary", "Fraud", "Theft"]
+
+def _data(n_rows=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    cases = rng.integers(0, 20, n_rows).astype(float)
+    cases[rng.random(n_rows) < 0.05] = np.nan
+    crimes = pd.Categorical(rng.choice(CRIMES, n_rows), categories=CRIMES)
+    crimes[rng.random(n_rows) < 0.05] = np.nan
+    return pd.DataFrame({
+        "Crime Detail": crimes,
+        "Year": rng.integers(2019, 2025, n_rows),
+        # Categories in label order, as the ingest step produces them
+        "Province": pd.Categorical(rng.choice(PROVINCES, n_rows), categories=PROVINCES),
+        "Number of Cases": cases,
+    })
+
+@pytest.mark.parametrize("sort_by", ["Year", "Province", "Crime Detail", "Number of Cases"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_window_matches_stable_sort_values(sort_by, ascending):
+    df = _data()
+    index = FilterIndex(df)
+    selections_list = [{}, {"Province": ["Eastern", "Western"]}, {"Year": [2020, 2023], "Crime Detail": ["Theft"]}]
+
+    for selections in selections_list:
+        filtered = index.filter(selections)
+        expected = filtered.sort_values(sort_by, ascending=ascending, kind="stable", na_position="last")
+        for offset in (0, 250, len(expected) - 40):
+            page, total = index.window(selections, sort_by=sort_by, ascending=ascending, offset=offset, limit=100)
+            assert total == len(expected)
+            pd.testing.assert_frame_equal(page, expected.iloc[offset:offset + 100])
+
+def test_window_without_sort_keeps_dataset_order():
+    df = _data()
+    index = FilterIndex(df)
+    page, total = index.window({"Province": ["Northern"]}, offset=10, limit=50)
+    expected = df[df["Province"] == "Northern"]
+    assert total == len(expected)
+    pd.testing.assert_frame_equal(page, expected.iloc[10:60])
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.summary_stats import RELATIVE_ACCURACY, PartitionStats, log_buckets
+
+PROVINCES = ["Kigali City", "Northern", "Southern", "Eastern", "Western"]
+CRIMES = ["Theft", "Fraud", "Assault", "Burglary"]
+
+def _data(cases, seed=0):
+    rng = np.random.default_rng(seed)
+    n_rows = len(cases)
+    return pd.DataFrame({
+        "Crime Detail": pd.Categorical(rng.choice(CRIMES, n_rows)),
+        "Year": rng.integers(2015, 2025, n_rows),
+        "Province": pd.Categorical(rng.choice(PROVINCES, n_rows)),
+        "Number of Cases": cases,
+    })
+
+def _selections(rng):
+    return {
+        "Province": list(rng.choice(PROVINCES, rng.integers(0, 3), replace=False)),
+        "Year": [int(year) for year in rng.choice(np.arange(2015, 2025), rng.integers(0, 4), replace=False)],
+        "Crime Detail": list(rng.choice(CRIMES, rng.integers(0, 3), replace=False)),
+    }
+
+def _filter(df, selections):
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in selections.items():
+        if values:
+            mask &= df[column].isin(values).to_numpy()
+    return df[mask]
+
+def test_exact_columns_match_describe():
+    rng = np.random.default_rng(1)
+    cases = rng.integers(0, 500, 20_000).astype(float)
+    cases[rng.random(len(cases)) < 0.02] = np.nan
+    df = _data(cases)
+    stats = PartitionStats(df)
+    assert stats.exact
+
+    for _ in range(200):
+        selections = _selections(rng)
+        expected = _filter(df, selections).describe()
+        result = stats.describe(selections)
+        assert np.allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-12, atol=1e-9, equal_nan=True)
+
+@pytest.mark.parametrize("sigma", [1.0, 2.0, 3.0])
+def test_skewed_quartiles_within_relative_accuracy(sigma):
+    rng = np.random.default_rng(2)
+    df = _data(np.round(rng.lognormal(3, sigma, 300_000), 2))
+    stats = PartitionStats(df)
+    assert not stats.exact
+
+    for selections in [None] + [_selections(rng) for _ in range(20)]:
+        expected = _filter(df, selections or {}).describe()["Number of Cases"]
+        result = stats.describe(selections)["Number of Cases"]
+        for row in ["25%", "50%", "75%"]:
+            assert abs(result[row] - expected[row]) <= RELATIVE_ACCURACY * abs(expected[row]) * (1 + 1e-9)
+        for row in ["count", "min", "max"]:
+            assert result[row] == expected[row]
+        assert np.isclose(result["mean"], expected["mean"], rtol=1e-9)
+
+def test_log_buckets_keep_sign_and_relative_error():
+    values = np.concatenate([-np.logspace(-6, 9, 1000), [0.0], np.logspace(-6, 9, 1000)])
+    buckets = log_buckets(values)
+    assert buckets[1000] == 0
+    assert np.all(np.sign(buckets) == np.sign(values))
+    nonzero = values != 0
+    assert np.all(np.abs(buckets[nonzero] - values[nonzero]) <= RELATIVE_ACCURACY * np.abs(values[nonzero]) * (1 + 1e-9))
@@ -1,38 +1,236 @@
+import argparse
+import json
+import os
+import pickle
+import time
+import hashlib
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
+from joblib import Parallel, delayed
+from sklearn.model_selection import KFold, ParameterGrid, cross_val_score, train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
-import joblib
-
-# Load data
-df = pd.read_csv("rwanda_crime.csv")
-
-# Show available columns
-print("📋 Columns in CSV:", df.columns.tolist())
+from sklearn.tree._tree import Tree
+from utils.compact_forest import CompactForest
+from utils.encoding import FeatureEncoder
+from utils.forecast import file_hash
+from utils.model_bundle import BUNDLE_DIR, load_model_artifacts, save_bundle
 
 # Target and features (update this list based on actual CSV columns)
 label_column = "Crime Detail"
-features = ["Year", "Province", "Number of Cases"]  # Removed 'Quarter'
+# Only inputs the prediction form collects: 'Number of Cases' is unknown at prediction time
+features = ["Year", "Province"]  # Removed 'Quarter' and 'Number of Cases'
+
+# Hyperparameters tried by --search unless --search-space points at a JSON file
+DEFAULT_SEARCH_SPACE = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [None, 8, 16],
+    "min_samples_leaf": [1, 2, 4],
+    "class_weight": [None, "balanced"],
+}
+LEADERBOARD_FILE = "training_leaderboard.csv"
+
+# Incremental updates: share of the new rows held out for the drift check, and
+# the largest accuracy drop on that window accepted without --force
+UPDATE_HOLDOUT = 0.2
+MAX_ACCURACY_DROP = 0.05
+
+def evaluate_candidate(index, params, X, y, cv_folds, random_state=42):
+    """Cross-validate one hyperparameter set and measure its size and latency."""
+    model = RandomForestClassifier(random_state=random_state, **params)
+    folds = KFold(n_splits=cv_folds, shuffle=True, random_state=random_state)
+    scores = cross_val_score(model, X, y, cv=folds, scoring="accuracy")
+
+    model.fit(X, y)
+    row = X.iloc[:1]
+    timings = []
+    for _ in range(20):
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "candidate": index,
+        **{name: params[name] for name in sorted(params)},
+        "cv_accuracy": scores.mean(),
+        "cv_std": scores.std(),
+        "model_kb": len(pickle.dumps(model)) / 1024,
+        "latency_ms": sorted(timings)[len(timings) // 2] * 1000,
+    }
+
+def search_hyperparameters(X, y, search_space, cv_folds=5, n_jobs=-1):
+    """Evaluate every candidate in the search space across a process pool."""
+    candidates = list(ParameterGrid(search_space))
+    print(f"🔎 Evaluating {len(candidates)} candidates with {cv_folds}-fold cross-validation...")
+    results = Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(evaluate_candidate)(index, params, X, y, cv_folds) for index, params in enumerate(candidates)
+    )
+
+    leaderboard = pd.DataFrame(results).sort_values(
+        ["cv_accuracy", "latency_ms", "model_kb"], ascending=[False, True, True]
+    ).reset_index(drop=True)
+    return candidates, leaderboard
+
+def prepare_features(df, encoder=None):
+    """Encode the feature columns with a fitted encoder, fitting one on ``df`` if none is given."""
+    missing_cols = [col for col in features + [label_column] if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing columns in dataset: {missing_cols}")
+
+    if encoder is None:
+        encoder = FeatureEncoder.fit(df, numeric=["Year"], categorical=["Province"])
+    try:
+        X = encoder.transform(df)
+    except ValueError as e:
+        raise ValueError(f"New data has categories the model was not trained on: {e}; run a full retrain") from e
+    return pd.DataFrame(X, columns=encoder.feature_names), encoder
+
+def _expand_tree_classes(estimator, tree_classes, n_classes):
+    """Re-index a fitted tree's leaf values from its own classes to the forest's classes."""
+    state = estimator.tree_.__getstate__()
+    values = np.zeros((state["values"].shape[0], 1, n_classes))
+    values[:, :, tree_classes] = state["values"]
+
+    tree = Tree(estimator.n_features_in_, np.array([n_classes], dtype=np.intp), 1)
+    tree.__setstate__(dict(state, values=values))
+    estimator.tree_ = tree
+    estimator.classes_ = np.arange(n_classes)
+    estimator.n_classes_ = n_classes
+
+def grow_forest(model, X_new, y_new, n_trees):
+    """Add ``n_trees`` trees trained only on new rows to a fitted random forest.
+
+    ``y_new`` is encoded with the persisted label encoder. New trees usually see
+    only some of the classes, so their leaf values are re-indexed onto the
+    forest's class columns before they join the ensemble.
+    """
+    positions = {label: i for i, label in enumerate(model.classes_)}
+    unknown = sorted(set(y_new) - set(positions))
+    if unknown:
+        raise ValueError("New data contains crime types the model was not trained on; run a full retrain")
+    y_positions = np.array([positions[label] for label in y_new])
+
+    params = {
+        name: value for name, value in model.get_params().items()
+        if name not in ("n_estimators", "warm_start", "oob_score")
+    }
+    params["random_state"] = None
+    delta = RandomForestClassifier(n_estimators=n_trees, **params).fit(X_new, y_positions)
+
+    for estimator in delta.estimators_:
+        _expand_tree_classes(estimator, delta.classes_, len(model.classes_))
+    model.estimators_ = model.estimators_ + delta.estimators_
+    model.n_estimators = len(model.estimators_)
+    return model
+
+def update_model(new_csv, n_trees=None, holdout=UPDATE_HOLDOUT, max_accuracy_drop=MAX_ACCURACY_DROP, force=False):
+    """Grow the saved model with trees trained on a new period of data."""
+    assets = load_model_artifacts()
+    model = assets["model"]
+    label_encoder = assets["label_encoder"]
+    encoder = assets["encoder"]
+    if encoder.fill_values:
+        raise ValueError(
+            f"The saved model uses features the form does not collect {sorted(encoder.fill_values)}; run a full retrain"
+        )
+
+    new_df = pd.read_csv(new_csv)
+    print(f"📥 {len(new_df):,} new rows from {new_csv}")
+    X_new, _ = prepare_features(new_df, encoder)
+
+    unknown_labels = sorted(set(new_df[label_column]) - set(label_encoder.classes_))
+    if unknown_labels:
+        raise ValueError(f"New crime types {unknown_labels} are not in the label encoder; run a full retrain")
+    y_new = label_encoder.transform(new_df[label_column])
+
+    # Hold out the most recent rows to check the update against
+    order = np.argsort(new_df["Year"].to_numpy(), kind="stable")
+    n_holdout = max(1, int(len(order) * holdout)) if len(order) > 1 else 0
+    train_idx, holdout_idx = order[:len(order) - n_holdout], order[len(order) - n_holdout:]
+    if not len(train_idx):
+        raise ValueError("Not enough new rows to train on after holding out the drift window")
+
+    before = model.score(X_new.iloc[holdout_idx], y_new[holdout_idx]) if n_holdout else None
+    baseline = assets["extras"].get("holdout_accuracy")
+    if before is not None and baseline is not None and baseline - before > max_accuracy_drop:
+        print(f"⚠️ Drift: the current model scores {before:.3f} on the new window vs {baseline:.3f} at training time")
+
+    n_trees = n_trees or max(10, model.n_estimators // 10)
+    grow_forest(model, X_new.iloc[train_idx], y_new[train_idx], n_trees)
+
+    after = model.score(X_new.iloc[holdout_idx], y_new[holdout_idx]) if n_holdout else None
+    if before is not None:
+        print(f"🎯 Drift window accuracy: {before:.3f} before, {after:.3f} after adding {n_trees} trees")
+        if before - after > max_accuracy_drop and not force:
+            raise SystemExit("❌ The update made the model worse on the drift window; not saved (use --force to keep it)")
+
+    # Chain the training data hash so the bundle records every period it has seen
+    previous_hash = (assets["manifest"] or {}).get("training_data_hash") or ""
+    training_data_hash = hashlib.sha256(f"{previous_hash}:{file_hash(new_csv)}".encode("ascii")).hexdigest()
+    extras = dict(assets["extras"], compact_forest=CompactForest.from_model(model).to_arrays())
+    if after is not None:
+        extras["holdout_accuracy"] = after
+    manifest = save_bundle(model, label_encoder, encoder, training_data_hash, extras=extras)
+
+    print(f"✅ Model updated to {model.n_estimators} trees and saved to {BUNDLE_DIR}/ (version {manifest['payload']['sha256'][:12]}).")
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the crime type prediction model.")
+    parser.add_argument("--search", action="store_true", help="tune hyperparameters with cross-validation before training")
+    parser.add_argument("--search-space", help="JSON file mapping RandomForestClassifier parameters to candidate lists")
+    parser.add_argument("--cv", type=int, default=5, help="number of cross-validation folds (default: 5)")
+    parser.add_argument("--jobs", type=int, default=-1, help="worker processes for the search (default: all cores)")
+    parser.add_argument("--update", metavar="NEW_CSV", help="grow the saved model with trees trained on new rows only")
+    parser.add_argument("--new-trees", type=int, help="trees to add in --update mode (default: 10%% of the forest, at least 10)")
+    parser.add_argument("--force", action="store_true", help="save an --update even if it fails the drift check")
+    args = parser.parse_args()
+
+    if args.update:
+        update_model(args.update, n_trees=args.new_trees, force=args.force)
+        return
+
+    # Load data
+    df = pd.read_csv("rwanda_crime.csv")
+
+    # Show available columns
+    print("📋 Columns in CSV:", df.columns.tolist())
+
+    # Prepare features and label
+    X, encoder = prepare_features(df)
+    label_encoder = LabelEncoder().fit(df[label_column])
+    y = label_encoder.transform(df[label_column])  # Encode target
+
+    # Train-test split
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    params = {}
+    if args.search:
+        search_space = DEFAULT_SEARCH_SPACE
+        if args.search_space:
+            with open(args.search_space) as f:
+                search_space = json.load(f)
 
-# Check if required columns exist
-missing_cols = [col for col in features + [label_column] if col not in df.columns]
-if missing_cols:
-    raise ValueError(f"Missing columns in dataset: {missing_cols}")
+        candidates, leaderboard = search_hyperparameters(X_train, y_train, search_space, args.cv, args.jobs)
+        leaderboard.to_csv(LEADERBOARD_FILE, index=False)
+        print(leaderboard.head(10).to_string(index=False))
+        print(f"🏆 Leaderboard saved to {os.path.abspath(LEADERBOARD_FILE)}")
 
-# Prepare features and label
-X = pd.get_dummies(df[features])  # One-hot encode categorical features
-y = LabelEncoder().fit_transform(df[label_column])  # Encode target
+        params = dict(candidates[leaderboard.loc[0, "candidate"]], random_state=42)
+        print("🥇 Best parameters:", params)
 
-# Train-test split
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    # Train model
+    model = RandomForestClassifier(**params)
+    model.fit(X_train, y_train)
+    holdout_accuracy = model.score(X_test, y_test)
+    print(f"🎯 Hold-out accuracy: {holdout_accuracy:.3f}")
 
-# Train model
-model = RandomForestClassifier()
-model.fit(X_train, y_train)
+    # Save model, label encoder and feature encoder as one versioned bundle
+    manifest = save_bundle(
+        model, label_encoder, encoder, file_hash("rwanda_crime.csv"),
+        extras={"holdout_accuracy": holdout_accuracy, "compact_forest": CompactForest.from_model(model).to_arrays()}
+    )
 
-# Save model and encoders
-joblib.dump(model, "crime_model.pkl")
-joblib.dump(LabelEncoder().fit(df[label_column]), "label_encoder.pkl")
-joblib.dump(X.columns.tolist(), "model_features.pkl")
+    print(f"✅ Model trained and saved to {BUNDLE_DIR}/ (version {manifest['payload']['sha256'][:12]}).")
 
-print("✅ Model trained and saved successfully.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+from functools import cached_property
+
+CUBE_DIMENSIONS = ["Province", "Year", "Crime Detail"]
+MEASURE = "Number of Cases"
+
+class AggregateCube:
+    """Case totals over (Province, Year, Crime Detail), built in a single pass.
+
+    Marginal rollups are derived from the cube cells rather than the raw rows,
+    so each one costs a scan of the (small) cube and is computed only once.
+    """
+
+    def __init__(self, df):
+        self.cells = df.groupby(CUBE_DIMENSIONS, observed=True, dropna=False)[MEASURE].sum()
+
+    def rollup(self, dimension):
+        """Total cases per value of one dimension, sorted by that value."""
+        return self.cells.groupby(level=dimension, observed=True).sum()
+
+    @cached_property
+    def total(self):
+        return self.cells.sum()
+
+    @cached_property
+    def by_province(self):
+        return self.rollup("Province")
+
+    @cached_property
+    def by_year(self):
+        return self.rollup("Year")
+
+    @cached_property
+    def by_crime(self):
+        return self.rollup("Crime Detail")
@@ -0,0 +1,147 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+
+MAX_BATCH_ROWS = 256
+MAX_WAIT_MS = 2.0
+
+class Histogram:
+    """Counts observations into fixed, cumulative-friendly buckets."""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = int(np.searchsorted(self.bounds, value, side="left"))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    def snapshot(self):
+        with self._lock:
+            buckets = {f"le_{bound:g}": n for bound, n in zip(self.bounds, self.counts)}
+            buckets["inf"] = self.counts[-1]
+            return {
+                "count": self.count,
+                "mean": self.total / self.count if self.count else 0.0,
+                "buckets": buckets,
+            }
+
+class _Request:
+    __slots__ = ("rows", "future", "enqueued")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+class MicroBatcher:
+    """Coalesces concurrent scoring requests into one vectorized call.
+
+    Callers ``submit`` a 2-D feature matrix and get a future for their slice of
+    the output. A background thread gathers requests until ``max_batch_rows``
+    rows are waiting or the oldest has waited ``max_wait_ms``, scores them with
+    a single ``score_fn`` call and fans the results back out. With ``threads``
+    above 1, that many batches can be scored at once, for a ``score_fn`` that
+    runs outside the GIL such as a worker-process pool.
+    """
+
+    def __init__(self, score_fn, max_batch_rows=MAX_BATCH_ROWS, max_wait_ms=MAX_WAIT_MS, name="micro-batcher", threads=1):
+        self.score_fn = score_fn
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.batch_rows = Histogram((1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024))
+        self.wait_ms = Histogram((0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100))
+        self._queue = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i}" if threads > 1 else name, daemon=True)
+            for i in range(threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, rows):
+        """Queue a feature matrix for scoring and return a future of its outputs."""
+        request = _Request(np.asarray(rows))
+        with self._close_lock:
+            if not self._closed:
+                self._queue.put(request)
+                return request.future
+
+        # A closed batcher still answers late callers, one call each
+        try:
+            request.future.set_result(self.score_fn(request.rows))
+        except Exception as e:
+            request.future.set_exception(e)
+        return request.future
+
+    def close(self):
+        """Stop the background threads once the requests already queued are scored."""
+        with self._close_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+
+    def stats(self):
+        """Batch-size (rows) and queue-wait (ms) histograms."""
+        return {"batch_rows": self.batch_rows.snapshot(), "wait_ms": self.wait_ms.snapshot()}
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        size = len(first.rows)
+        deadline = first.enqueued + self.max_wait
+        while size < self.max_batch_rows:
+            # Take whatever is already queued; only wait while the oldest request is young
+            timeout = deadline - time.perf_counter()
+            try:
+                if timeout > 0:
+                    request = self._queue.get(timeout=timeout)
+                else:
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                # Put the stop marker back so the loop ends after this batch
+                self._queue.put(None)
+                break
+            batch.append(request)
+            size += len(request.rows)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                # Leave the stop marker for the other threads
+                self._queue.put(None)
+                return
+            started = time.perf_counter()
+            for request in batch:
+                self.wait_ms.observe((started - request.enqueued) * 1000)
+
+            rows = batch[0].rows if len(batch) == 1 else np.concatenate([r.rows for r in batch])
+            self.batch_rows.observe(len(rows))
+            try:
+                outputs = self.score_fn(rows)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            start = 0
+            for request in batch:
+                end = start + len(request.rows)
+                request.future.set_result(outputs[start:end])
+                start = end
@@ -0,0 +1,82 @@
+import numpy as np
+from utils.sketches import Z_95
+
+# Years forecast past the last observed one
+HORIZON = 3
+SERIES_KEYS = ["Province", "Crime Detail"]
+# Smoothing weights tried for the level (alpha) and the trend (beta) of every series
+SMOOTHING_GRID = np.round(np.linspace(0.1, 0.9, 9), 2)
+MIN_YEARS = 3
+
+def case_matrix(cells, keys=SERIES_KEYS):
+    """Yearly case totals as a (series x year) matrix, with years missing from a series as 0.
+
+    ``cells`` are case totals indexed by at least ``keys`` and Year, such as
+    ``AggregateCube.cells``.
+    """
+    cells = cells.groupby(level=keys + ["Year"], observed=True).sum()
+    table = cells.unstack("Year", fill_value=0)
+    years = np.arange(table.columns.min(), table.columns.max() + 1)
+    table = table.reindex(columns=years, fill_value=0)
+    return table.index, years, table.to_numpy(dtype=np.float64)
+
+def holt_forecast(Y, horizon=HORIZON, grid=SMOOTHING_GRID, z=Z_95):
+    """Fit Holt's linear trend smoothing to every row of ``Y`` at once.
+
+    All (alpha, beta) pairs of the grid are run together as a (pairs x series)
+    state, one vectorized step per year, and each series keeps the pair with
+    the smallest one-step-ahead squared error. Returns arrays of shape
+    (series, horizon) for the forecast and its ``z``-sigma interval, plus the
+    chosen alpha and beta per series.
+    """
+    n_series, n_years = Y.shape
+    if n_years < MIN_YEARS:
+        raise ValueError(f"Forecasting needs at least {MIN_YEARS} years of data, got {n_years}")
+
+    alpha, beta = (values.ravel()[:, None] for values in np.meshgrid(grid, grid, indexing="ij"))
+    level = np.broadcast_to(Y[:, 1], (len(alpha), n_series)).copy()
+    trend = np.broadcast_to(Y[:, 1] - Y[:, 0], (len(alpha), n_series)).copy()
+    sse = np.zeros((len(alpha), n_series))
+    for t in range(2, n_years):
+        predicted = level + trend
+        sse += (Y[:, t] - predicted) ** 2
+        new_level = alpha * Y[:, t] + (1 - alpha) * predicted
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        level = new_level
+
+    best = np.argmin(sse, axis=0)
+    columns = np.arange(n_series)
+    best_alpha, best_beta = alpha[best, 0], beta[best, 0]
+    steps = np.arange(1, horizon + 1)
+    forecast = level[best, columns][:, None] + steps * trend[best, columns][:, None]
+
+    # h-step variance of the additive Holt model: sigma^2 * (1 + sum_{j<h} alpha^2 (1 + j beta)^2)
+    sigma2 = sse[best, columns] / (n_years - 2)
+    growth = (best_alpha[:, None] * (1 + np.arange(horizon) * best_beta[:, None])) ** 2
+    growth[:, 0] = 0
+    half_width = z * np.sqrt(sigma2[:, None] * (1 + np.cumsum(growth, axis=1)))
+
+    return {
+        "forecast": np.clip(forecast, 0, None),
+        "lower": np.clip(forecast - half_width, 0, None),
+        "upper": np.clip(forecast + half_width, 0, None),
+        "alpha": best_alpha,
+        "beta": best_beta,
+    }
+
+def forecast_cases(cells, keys=SERIES_KEYS, horizon=HORIZON):
+    """Expected cases per series for the next ``horizon`` years, with 95% intervals.
+
+    Returns one row per (series, year), indexed by ``keys`` and Year.
+    """
+    index, years, Y = case_matrix(cells, keys)
+    fit = holt_forecast(Y, horizon)
+    future = years[-1] + np.arange(1, horizon + 1)
+
+    frame = index.to_frame(index=False).loc[np.repeat(np.arange(len(index)), horizon)].reset_index(drop=True)
+    frame["Year"] = np.tile(future, len(index))
+    for column in ("forecast", "lower", "upper"):
+        frame[column] = fit[column].ravel()
+    frame["alpha"] = np.repeat(fit["alpha"], horizon)
+    frame["beta"] = np.repeat(fit["beta"], horizon)
+    return frame.set_index(keys + ["Year"])
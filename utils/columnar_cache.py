@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+from utils.forecast import file_hash
+from utils.ingest import CRIME_SCHEMA
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = ".cache"
+# Bump when the on-disk layout or the ingestion schema changes
+CACHE_FORMAT = 1
+
+def _cache_paths(path):
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    name = os.path.basename(path)
+    return directory, os.path.join(directory, f"{name}.feather"), os.path.join(directory, f"{name}.json")
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_atomic(target, write):
+    tmp = f"{target}.tmp-{os.getpid()}"
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def _write_meta(meta, tmp):
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+
+def _read_columnar(data_path):
+    # Uncompressed Arrow IPC is memory-mapped; numeric columns convert without a copy
+    table = feather.read_table(data_path, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+def load_with_cache(path, reader):
+    """Load ``path`` through ``reader``, reusing a Feather sidecar when it is still valid.
+
+    The sidecar is keyed by the source file's size, mtime and SHA-256; a
+    changed size or mtime triggers a re-hash, and only a changed hash triggers
+    a re-parse. Returns the DataFrame and the source file's content hash.
+    """
+    stat = os.stat(path)
+    signature = {"format": CACHE_FORMAT, "schema": CRIME_SCHEMA, "size": stat.st_size}
+    directory, data_path, meta_path = _cache_paths(path)
+    meta = _read_meta(meta_path) if feather is not None else None
+    cached = meta is not None and os.path.exists(data_path) and all(
+        meta.get(key) == value for key, value in signature.items()
+    )
+
+    if cached and meta.get("mtime_ns") == stat.st_mtime_ns:
+        return _read_columnar(data_path), meta["sha256"]
+
+    content_hash = file_hash(path)
+    if cached and meta.get("sha256") == content_hash:
+        df = _read_columnar(data_path)
+    else:
+        df = reader(path)
+        if feather is None:
+            return df, content_hash
+        try:
+            os.makedirs(directory, exist_ok=True)
+            _write_atomic(data_path, lambda tmp: feather.write_feather(df, tmp, compression="uncompressed"))
+        except OSError as e:
+            logger.warning("Could not write columnar cache for %s: %s", path, e)
+            return df, content_hash
+
+    meta = dict(signature, mtime_ns=stat.st_mtime_ns, sha256=content_hash)
+    try:
+        _write_atomic(meta_path, lambda tmp: _write_meta(meta, tmp))
+    except OSError as e:
+        logger.warning("Could not write columnar cache metadata for %s: %s", path, e)
+    return df, content_hash
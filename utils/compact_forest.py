@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+# Array names stored in the model bundle's extras under "compact_forest"
+FOREST_ARRAYS = ("feature", "threshold", "left", "right", "roots", "values", "classes")
+# Leaf values gathered at once while averaging, bounding scratch memory to about 32 MB
+LEAF_VALUE_CHUNK = 4_000_000
+
+class CompactForest:
+    """A fitted random forest flattened into contiguous node arrays.
+
+    Every tree's nodes are concatenated, children are global node indices and
+    leaf values are stored as class probabilities. ``predict_proba`` walks all
+    trees for all rows together, one vectorized step per tree level, so it has
+    none of sklearn's per-call validation or per-tree dispatch.
+    """
+
+    def __init__(self, feature, threshold, left, right, roots, values, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.roots = roots
+        self.values = values
+        self.classes_ = classes
+
+    @classmethod
+    def from_model(cls, model):
+        """Flatten a fitted ``RandomForestClassifier`` (single output)."""
+        features, thresholds, lefts, rights, roots, values = [], [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            leaf = tree.children_left == -1
+            roots.append(offset)
+            # Leaves point at themselves so finished paths stay put while deeper trees continue
+            own = np.arange(offset, offset + tree.node_count)
+            lefts.append(np.where(leaf, own, tree.children_left + offset))
+            rights.append(np.where(leaf, own, tree.children_right + offset))
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+
+            # Normalize each node to class probabilities, as DecisionTreeClassifier.predict_proba does
+            node_values = tree.value[:, 0, :len(model.classes_)].astype(np.float64)
+            totals = node_values.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1
+            values.append(node_values / totals)
+            offset += tree.node_count
+
+        return cls(
+            np.concatenate(features).astype(np.intp),
+            np.concatenate(thresholds).astype(np.float64),
+            np.concatenate(lefts).astype(np.intp),
+            np.concatenate(rights).astype(np.intp),
+            np.asarray(roots, dtype=np.intp),
+            np.concatenate(values),
+            np.asarray(model.classes_),
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(*(arrays[name] for name in FOREST_ARRAYS))
+
+    def to_arrays(self):
+        """Plain numpy arrays suitable for the bundle extras (and memory-mapping)."""
+        return {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "roots": self.roots,
+            "values": self.values,
+            "classes": self.classes_,
+        }
+
+    def predict_proba(self, X):
+        """Class probabilities averaged over the trees, matching ``model.predict_proba``."""
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        while True:
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            next_nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            if np.array_equal(next_nodes, nodes):
+                break
+            nodes = next_nodes
+
+        # Sum the leaf values a few trees at a time instead of gathering rows x trees x classes
+        n_rows, n_trees = nodes.shape
+        n_classes = self.values.shape[1]
+        step = max(1, LEAF_VALUE_CHUNK // max(n_rows * n_classes, 1))
+        proba = np.zeros((n_rows, n_classes))
+        for start in range(0, n_trees, step):
+            proba += self.values[nodes[:, start:start + step]].sum(axis=1)
+        return proba / n_trees
+
+def verify_forest(forest, model, X, atol=1e-9):
+    """Whether the compact forest reproduces ``model.predict_proba`` on ``X``."""
+    expected = model.predict_proba(pd.DataFrame(X, columns=getattr(model, "feature_names_in_", None)))
+    return np.array_equal(forest.classes_, model.classes_) and np.allclose(forest.predict_proba(X), expected, rtol=0, atol=atol)
@@ -1,33 +1,141 @@
 import streamlit as st
-import pandas as pd
-import joblib
-import os
+import functools
+import logging
+from utils.aggregates import AggregateCube
+from utils.case_forecast import forecast_cases
+from utils.columnar_cache import load_with_cache
+from utils.filter_index import FilterIndex
+from utils.forecast import build_forecast_table
+from utils.hot_reload import AssetStore, poll_seconds
+from utils.inference import load_compact_forest, make_batcher, make_process_scorer
+from utils.ingest import read_crime_csv
+from utils.model_bundle import load_model_artifacts, model_artifact_paths
+from utils.perf import cached, ensure_log_handler
+from utils.summary_stats import PartitionStats
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE = "rwanda_crime.csv"
+# Data versions each derived-structure cache keeps, so sessions on a replaced dataset still hit
+DATA_VERSIONS_CACHED = 4
+
+_data_version_caches = []
+
+def _read_data():
+    # Row-count progress goes to the terminal running the dashboard
+    ensure_log_handler(logger)
+    df, data_version = load_with_cache(
+        DATA_FILE,
+        lambda path: read_crime_csv(
+            path,
+            progress=lambda rows: logger.info("Loaded %s crime records", f"{rows:,}")
+        )
+    )
+    df.attrs["data_version"] = data_version
+    return df
+
+def _retire_data(df):
+    # The filter index and the other per-version structures hold the old frame; drop them so it can be freed
+    for build_version in _data_version_caches:
+        build_version.clear()
+
+@cached("data_store", st.cache_resource)
+def _data_store():
+    return AssetStore("data", [DATA_FILE], _read_data, poll_seconds(), on_retire=_retire_data).start()
 
-@st.cache_data
 def load_data():
-    """Load and cache the crime dataset."""
+    """Return the current crime dataset; a changed CSV is reloaded in the background and swapped in."""
     try:
-        df = pd.read_csv("rwanda_crime.csv")
+        df = _data_store().get()
         st.session_state['data_loaded'] = True
         return df
     except FileNotFoundError:
         st.error("❌ Error: 'rwanda_crime.csv' not found in the working directory.")
         st.session_state['data_loaded'] = False
         return None
+    except (ValueError, MemoryError) as e:
+        st.error(f"❌ Error loading 'rwanda_crime.csv': {e}")
+        st.session_state['data_loaded'] = False
+        return None
+
+def _load_model_assets():
+    assets = load_model_artifacts()
+    assets["forecast_table"] = get_forecast_table(
+        assets["model_version"], assets["model"], assets["label_encoder"], assets["encoder"]
+    )
+    assets["compact_forest"] = load_compact_forest(assets)
+    assets["process_scorer"] = make_process_scorer(assets)
+    assets["batcher"] = make_batcher(assets)
+    return assets
+
+def _retire_model_assets(assets):
+    # Sessions still holding the old assets get answered without the batcher thread or worker pool
+    assets["batcher"].close()
+    if assets["process_scorer"] is not None:
+        assets["process_scorer"].close()
+
+@cached("model_store", st.cache_resource)
+def _model_store():
+    return AssetStore(
+        "model", model_artifact_paths(), _load_model_assets, poll_seconds(), on_retire=_retire_model_assets
+    ).start()
 
-@st.cache_resource
 def load_model_assets():
-    """Load and cache the prediction model and related assets."""
+    """Return the current prediction model and related assets; retrained artifacts are swapped in live."""
     try:
-        model = joblib.load("crime_model.pkl")
-        label_encoder = joblib.load("label_encoder.pkl")
-        model_features = joblib.load("model_features.pkl")
-        return {
-            "model": model,
-            "label_encoder": label_encoder,
-            "model_features": model_features
-        }
+        return _model_store().get()
     except Exception as e:
         st.error(f"⚠️ Model loading error: {e}")
         st.warning("Prediction functionality will be disabled.")
-        return None
\ No newline at end of file
+        return None
+
+@cached("get_forecast_table", st.cache_resource)
+def get_forecast_table(model_version, _model, _label_encoder, _encoder):
+    """Precompute and cache predictions for every Province x Year, per model version."""
+    return build_forecast_table(_model, _label_encoder, _encoder)
+
+def per_data_version(name, variants=1):
+    """Cache ``build(df, *args)`` once per data version of ``df`` and ``args``.
+
+    Frames without a data version, such as ones built outside ``load_data``,
+    are built directly. ``variants`` is how many ``args`` combinations exist,
+    so every cache keeps the same number of data versions.
+    """
+    def decorate(build):
+        def build_version(data_version, args, _df):
+            return build(_df, *args)
+
+        # Streamlit keys a cache by the function's module, qualified name and source, which
+        # every build_version shares, so each takes its builder's name
+        build_version.__module__, build_version.__qualname__ = build.__module__, build.__qualname__
+        build_version = cached(name, st.cache_resource(max_entries=DATA_VERSIONS_CACHED * variants))(build_version)
+        _data_version_caches.append(build_version)
+
+        @functools.wraps(build)
+        def get(df, *args):
+            data_version = df.attrs.get("data_version")
+            if data_version is None:
+                return build(df, *args)
+            return build_version(data_version, args, df)
+        return get
+    return decorate
+
+@per_data_version("get_aggregate_cube")
+def get_aggregate_cube(df):
+    """Return the aggregate cube for a dataset, built once per data version."""
+    return AggregateCube(df)
+
+@per_data_version("get_filter_index")
+def get_filter_index(df):
+    """Return the Data Explorer filter index for a dataset, built once per data version."""
+    return FilterIndex(df)
+
+@per_data_version("get_partition_stats")
+def get_partition_stats(df):
+    """Return the per-partition summary statistics for a dataset, built once per data version."""
+    return PartitionStats(df)
+
+@per_data_version("get_case_forecast")
+def get_case_forecast(df):
+    """Return the per Province x Crime Detail case forecasts for a dataset, fitted once per data version."""
+    return forecast_cases(get_aggregate_cube(df).cells)
@@ -0,0 +1,89 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Raw inputs the prediction form collects
+NUMERIC_INPUTS = ["Year"]
+CATEGORICAL_INPUTS = ["Province"]
+
+class FeatureEncoder:
+    """Fitted mapping from raw (Province, Year) inputs to the model's feature matrix.
+
+    Produces the same columns, in the same order, as ``pd.get_dummies`` on the
+    training frame, but writes straight into one preallocated numpy array. It is
+    saved in the model bundle so training and serving share one definition.
+
+    Unknown categories raise a ValueError unless ``handle_unknown="ignore"``,
+    which leaves their one-hot columns at zero. ``fill_values`` gives constants
+    for features the form does not collect, which only legacy models have.
+    """
+
+    def __init__(self, numeric, categories, fill_values=None, handle_unknown="error", feature_names=None):
+        self.numeric = list(numeric)
+        self.categories = {column: list(values) for column, values in categories.items()}
+        self.fill_values = dict(fill_values or {})
+        self.handle_unknown = handle_unknown
+
+        # Default column order is the one pd.get_dummies gives the training frame
+        self.feature_names = list(feature_names or list(self.numeric) + list(self.fill_values) + [
+            f"{column}_{value}" for column, values in self.categories.items() for value in values
+        ])
+        self._index = {name: i for i, name in enumerate(self.feature_names)}
+        self._category_index = {
+            column: {value: self._index[f"{column}_{value}"] for value in values}
+            for column, values in self.categories.items()
+        }
+
+    @classmethod
+    def fit(cls, df, numeric=NUMERIC_INPUTS, categorical=CATEGORICAL_INPUTS):
+        """Learn the category levels of each categorical input from a training frame."""
+        return cls(numeric, {column: sorted(df[column].dropna().unique().tolist()) for column in categorical})
+
+    @classmethod
+    def from_feature_names(cls, model_features):
+        """Rebuild the encoder of a model saved before encoders were persisted.
+
+        Features that are neither a known input nor one of its one-hot columns
+        are filled with 0, which is what the old ``reindex`` did implicitly.
+        """
+        numeric = [name for name in model_features if name in NUMERIC_INPUTS]
+        categories = {
+            column: [name[len(column) + 1:] for name in model_features if name.startswith(f"{column}_")]
+            for column in CATEGORICAL_INPUTS
+        }
+        one_hot = {f"{column}_{value}" for column, values in categories.items() for value in values}
+        fill_values = {name: 0.0 for name in model_features if name not in numeric and name not in one_hot}
+        if fill_values:
+            logger.warning(
+                "Model expects features the form does not collect %s; they are filled with 0. "
+                "Re-run train_model.py to drop them.", sorted(fill_values)
+            )
+
+        return cls(numeric, categories, fill_values, feature_names=model_features)
+
+    def transform(self, data, handle_unknown=None):
+        """Encode a mapping of input columns (a DataFrame or dict of sequences) into a matrix."""
+        handle_unknown = handle_unknown or self.handle_unknown
+        first = (self.numeric + list(self.categories))[0]
+        n_rows = len(data[first])
+        X = np.zeros((n_rows, len(self.feature_names)))
+
+        for name, value in self.fill_values.items():
+            X[:, self._index[name]] = value
+        for column in self.numeric:
+            X[:, self._index[column]] = np.asarray(data[column], dtype=np.float64)
+
+        for column, lookup in self._category_index.items():
+            positions = np.fromiter((lookup.get(value, -1) for value in data[column]), dtype=np.intp, count=n_rows)
+            known = positions >= 0
+            if not known.all() and handle_unknown == "error":
+                unknown = sorted({str(value) for value, ok in zip(data[column], known) if not ok})
+                raise ValueError(f"Unknown {column} values: {unknown}")
+            rows = np.flatnonzero(known)
+            X[rows, positions[rows]] = 1
+        return X
+
+    def encode(self, provinces, years, handle_unknown=None):
+        """Encode parallel lists of provinces and years."""
+        return self.transform({"Province": provinces, "Year": years}, handle_unknown)
@@ -0,0 +1,100 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from utils.columnar_cache import CACHE_DIR, _write_atomic
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = pq = None
+
+EXPORT_DIR = os.path.join(CACHE_DIR, "exports")
+# Rows converted and written per step, bounding the memory an export needs
+EXPORT_CHUNK_ROWS = 100_000
+# Finished exports kept on disk; the least recently used are removed first
+MAX_CACHED_EXPORTS = 16
+
+# format -> (label, file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": ("CSV", ".csv", "text/csv"),
+    "csv.gz": ("CSV (gzip)", ".csv.gz", "application/gzip"),
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet"),
+}
+
+# A fixed set of locks, picked by export key, so concurrent requests for one export write it once
+EXPORT_LOCK_STRIPES = 32
+_locks = [threading.Lock() for _ in range(EXPORT_LOCK_STRIPES)]
+
+def available_formats():
+    """Export formats usable in this environment; Parquet needs pyarrow."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or pq is not None]
+
+def export_key(data_version, selections, fmt):
+    """Stable identifier of one (dataset version, filter combination, format) export."""
+    canonical = json.dumps(
+        {"data": data_version, "format": fmt, "selections": {k: sorted(map(str, v)) for k, v in selections.items()}},
+        sort_keys=True
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _chunks(df, positions, chunk_rows):
+    n_rows = len(df) if positions is None else len(positions)
+    for start in range(0, n_rows, chunk_rows):
+        if positions is None:
+            yield df.iloc[start:start + chunk_rows]
+        else:
+            yield df.take(positions[start:start + chunk_rows])
+
+def write_export(df, positions, path, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write the selected rows of ``df`` to ``path`` chunk by chunk.
+
+    ``positions`` are row positions as returned by ``FilterIndex.positions``;
+    None exports every row.
+    """
+    if fmt == "parquet":
+        schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in _chunks(df, positions, chunk_rows):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        return
+
+    opener = gzip.open if fmt == "csv.gz" else open
+    with opener(path, "wt", encoding="utf-8", newline="") as f:
+        df.iloc[:0].to_csv(f, index=False)
+        for chunk in _chunks(df, positions, chunk_rows):
+            chunk.to_csv(f, index=False, header=False)
+
+def _prune(directory, keep):
+    exports = sorted(
+        (entry for entry in os.scandir(directory) if entry.is_file() and ".tmp-" not in entry.name),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    for entry in exports[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+def get_export(filter_index, selections, fmt, data_version=None, directory=EXPORT_DIR):
+    """Path of the export file for a filter combination, writing it only if it is not cached.
+
+    Exports of a dataset without a version are always rewritten.
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    key = export_key(data_version, selections, fmt)
+    path = os.path.join(directory, key + EXPORT_FORMATS[fmt][1])
+    with _locks[hash(key) % EXPORT_LOCK_STRIPES]:
+        if data_version is not None and os.path.exists(path):
+            os.utime(path)
+            return path
+        os.makedirs(directory, exist_ok=True)
+        positions = filter_index.positions(selections)
+        _write_atomic(path, lambda tmp: write_export(filter_index.df, positions, tmp, fmt))
+        _prune(directory, MAX_CACHED_EXPORTS)
+    return path
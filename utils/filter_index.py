@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ["Year", "Province", "Crime Detail"]
+
+def _sort_keys(series):
+    """Values that order like the column, with categoricals ranked by label and missing last."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        label_rank = np.empty(len(categories) + 1, dtype=np.int64)
+        label_rank[:-1] = np.argsort(np.argsort(categories.to_numpy(), kind="stable"), kind="stable")
+        label_rank[-1] = len(categories)
+        return label_rank[series.cat.codes.to_numpy()]
+    return series.to_numpy()
+
+def _descending_keys(keys, missing):
+    """Keys whose ascending order is ``keys`` descending, ties kept equal and missing values last."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    new_value = np.ones(len(keys), dtype=bool)
+    new_value[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    dense = np.empty(len(keys), dtype=np.int64)
+    dense[order] = np.cumsum(new_value)
+    descending = dense.max(initial=0) - dense
+    descending[missing] = len(keys)
+    return descending
+
+def _intersect_sorted(small, large):
+    """Intersect two sorted, duplicate-free position arrays by probing the larger one."""
+    if not len(small) or not len(large):
+        return small[:0]
+    idx = np.searchsorted(large, small)
+    idx[idx == len(large)] = len(large) - 1
+    return small[large[idx] == small]
+
+class FilterIndex:
+    """Inverted index from each distinct column value to the row positions holding it.
+
+    A multiselect combination resolves to a union of posting lists per column
+    and an intersection across columns, followed by a single ``take``, so the
+    cost follows the size of the selection rather than the size of the dataset.
+    """
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.df = df
+        self.postings = {
+            column: df.groupby(column, observed=True, sort=True).indices
+            for column in columns
+        }
+        self._ranks = {}
+
+    def options(self, column):
+        """Distinct values of a column, sorted."""
+        return list(self.postings[column])
+
+    def positions(self, selections):
+        """Row positions matching every non-empty selection, or None if nothing is selected."""
+        matches = []
+        for column, values in selections.items():
+            if not values:
+                continue
+            postings = self.postings[column]
+            lists = [postings[value] for value in values if value in postings]
+            if not lists:
+                return np.empty(0, dtype=np.intp)
+            matches.append(lists[0] if len(lists) == 1 else np.sort(np.concatenate(lists)))
+
+        if not matches:
+            return None
+
+        matches.sort(key=len)
+        result = matches[0]
+        for other in matches[1:]:
+            result = _intersect_sorted(result, other)
+        return result
+
+    def count(self, selections):
+        """Number of rows matching the selections."""
+        positions = self.positions(selections)
+        return len(self.df) if positions is None else len(positions)
+
+    def filter(self, selections):
+        """Return the rows matching the selections; the full frame is returned uncopied."""
+        positions = self.positions(selections)
+        if positions is None:
+            return self.df
+        return self.df.take(positions)
+
+    def rank(self, column, ascending=True):
+        """Each row's position in the dataset sorted by ``column``, computed once per column and direction.
+
+        Matches a stable ``sort_values``: tied rows keep their dataset order and
+        missing values come last in either direction.
+        """
+        if (column, ascending) not in self._ranks:
+            keys = _sort_keys(self.df[column])
+            if not ascending:
+                keys = _descending_keys(keys, self.df[column].isna().to_numpy())
+            order = np.argsort(keys, kind="stable")
+            rank = np.empty(len(order), dtype=np.intp)
+            rank[order] = np.arange(len(order))
+            self._ranks[column, ascending] = (order, rank)
+        return self._ranks[column, ascending]
+
+    def window(self, selections, sort_by=None, ascending=True, offset=0, limit=100):
+        """One page of the matching rows, optionally sorted, plus the total match count.
+
+        Only the ``limit`` rows of the page are materialized; sorting uses the
+        precomputed rank of each row, so it never compares the column values.
+        """
+        positions = self.positions(selections)
+        total = len(self.df) if positions is None else len(positions)
+
+        if sort_by is None:
+            if positions is None:
+                return self.df.iloc[offset:offset + limit], total
+        else:
+            order, rank = self.rank(sort_by, ascending)
+            if positions is None:
+                positions = order
+            else:
+                positions = positions[np.argsort(rank[positions], kind="stable")]
+
+        return self.df.take(positions[offset:offset + limit]), total
@@ -0,0 +1,74 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Input space covered by the prediction form
+FORECAST_YEARS = range(2020, 2031)
+TOP_K = 3
+
+def file_hash(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def artifacts_version(paths):
+    """Combine the hashes of several artifact files into one version string."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(file_hash(path).encode("ascii"))
+    return digest.hexdigest()
+
+def province_options(encoder):
+    """Return the provinces the model was trained on, from its fitted encoder."""
+    return list(encoder.categories.get("Province", []))
+
+def decode_classes(model, label_encoder):
+    """Map the model's class columns to crime names, failing if they do not match."""
+    try:
+        return label_encoder.inverse_transform(model.classes_)
+    except ValueError as e:
+        raise ValueError(
+            "Model classes do not match the label encoder; "
+            "re-run train_model.py to regenerate the artifacts."
+        ) from e
+
+def encode_scenarios(encoder, provinces, years):
+    """Encode scenarios as a DataFrame carrying the model's feature names."""
+    return pd.DataFrame(encoder.encode(provinces, years), columns=encoder.feature_names)
+
+def decode_probabilities(class_names, proba, top_k=TOP_K):
+    """Turn a probability matrix into the label and top-k probabilities per row."""
+    top = np.argsort(-proba, axis=1, kind="stable")[:, :top_k]
+    return [
+        {
+            "crime": class_names[row[0]],
+            "probabilities": [(class_names[j], float(p[j])) for j in row],
+        }
+        for p, row in zip(proba, top)
+    ]
+
+def score_scenarios(model, label_encoder, encoder, provinces, years, top_k=TOP_K):
+    """Score a batch of scenarios in one call, returning the label and top-k probabilities."""
+    class_names = decode_classes(model, label_encoder)
+    proba = model.predict_proba(encode_scenarios(encoder, provinces, years))
+    return decode_probabilities(class_names, proba, top_k)
+
+def build_forecast_table(model, label_encoder, encoder, provinces=None, years=FORECAST_YEARS, top_k=TOP_K):
+    """Score the whole Province x Year input space, keyed by (province, year)."""
+    if provinces is None:
+        provinces = province_options(encoder)
+
+    grid = [(province, int(year)) for province in provinces for year in years]
+    if not grid:
+        return {}
+
+    results = score_scenarios(
+        model, label_encoder, encoder,
+        [province for province, _ in grid],
+        [year for _, year in grid],
+        top_k=top_k,
+    )
+    return dict(zip(grid, results))
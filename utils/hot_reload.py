@@ -0,0 +1,110 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the watched files; 0 turns the watcher off
+RELOAD_ENV = "CRIME_DASHBOARD_RELOAD_SECONDS"
+DEFAULT_POLL_SECONDS = 2.0
+
+def poll_seconds():
+    """The watcher interval from the environment, falling back to the default."""
+    try:
+        return float(os.environ.get(RELOAD_ENV, DEFAULT_POLL_SECONDS))
+    except ValueError:
+        return DEFAULT_POLL_SECONDS
+
+def file_signature(paths):
+    """Size and modification time of each path, None for missing files."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            signature.append((path, None))
+    return tuple(signature)
+
+class AssetStore:
+    """The current loaded version of a set of files, replaced as the files change.
+
+    ``get`` returns whatever version is current, loading the first one on the
+    calling thread. A watcher thread polls the files' signatures; once a change
+    has held still for one poll it loads and validates the new version in the
+    background (``loader`` raising means invalid) and swaps the reference in one
+    assignment. Callers that already hold the old value keep using it; it is
+    passed to ``on_retire`` after the swap. A failed load keeps the old version
+    and is not retried until the files change again.
+    """
+
+    def __init__(self, name, paths, loader, poll_seconds=DEFAULT_POLL_SECONDS, on_retire=None):
+        self.name = name
+        self.paths = list(paths)
+        self.loader = loader
+        self.poll_seconds = poll_seconds
+        self.on_retire = on_retire
+        self.version = 0
+        self.error = None
+        self._current = None  # (signature, value)
+        self._failed = None
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get(self):
+        current = self._current
+        if current is None:
+            self.reload()
+            current = self._current
+        return current[1]
+
+    def reload(self):
+        """Load the files if they differ from the current version; return whether it swapped."""
+        with self._load_lock:
+            signature = file_signature(self.paths)
+            if self._current is not None and signature == self._current[0]:
+                return False
+            # Signature first: a write landing during the load shows up as a change on the next poll
+            value = self.loader()
+            retired, self._current = self._current, (signature, value)
+            self.version += 1
+            self.error = None
+            self._failed = None
+
+        if retired is not None:
+            logger.info("Reloaded %s (version %d)", self.name, self.version)
+            if self.on_retire is not None:
+                self.on_retire(retired[1])
+        return True
+
+    def start(self):
+        """Start the watcher thread unless polling is turned off; safe to call more than once."""
+        if self.poll_seconds > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name=f"reload-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        pending = None
+        while not self._stop.wait(self.poll_seconds):
+            signature = file_signature(self.paths)
+            current = self._current
+            if current is not None and signature == current[0]:
+                pending = None
+                continue
+            # Wait for one unchanged poll so a file still being copied is not loaded
+            if signature != pending:
+                pending = signature
+                continue
+            if signature == self._failed:
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                self._failed = signature
+                self.error = str(e)
+                logger.warning("Reloading %s failed; keeping the current version: %s", self.name, e)
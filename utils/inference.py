@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from utils.batching import MicroBatcher
+from utils.compact_forest import CompactForest, verify_forest
+from utils.forecast import FORECAST_YEARS, decode_classes, decode_probabilities, province_options
+from utils.process_backend import ProcessScorer, inference_backend
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_WORKERS = 4
+# Random feature rows checked against the model before the compact forest is used
+VERIFY_ROWS = 256
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Return the process-wide executor that runs inference off the script thread."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+        return _executor
+
+def _verification_matrix(forest, encoder, rows=VERIFY_ROWS, seed=0):
+    """The forecast grid plus random rows spread around every split threshold."""
+    provinces = province_options(encoder)
+    grid = encoder.encode([p for p in provinces for _ in FORECAST_YEARS], [y for _ in provinces for y in FORECAST_YEARS])
+    rng = np.random.default_rng(seed)
+    random_rows = np.zeros((rows, len(encoder.feature_names)))
+    for j, feature in enumerate(encoder.feature_names):
+        thresholds = forest.threshold[(forest.feature == j) & np.isfinite(forest.threshold)]
+        if feature.startswith("Province_") or not len(thresholds):
+            random_rows[:, j] = rng.integers(0, 2, rows)
+        else:
+            random_rows[:, j] = np.round(rng.uniform(thresholds.min() - 1, thresholds.max() + 1, rows))
+    return np.vstack([grid, random_rows])
+
+def load_compact_forest(model_assets):
+    """The flattened forest for fast scoring, or None if it does not reproduce the model.
+
+    Uses the arrays exported into the bundle extras by train_model.py, or
+    flattens the loaded model for legacy pickles.
+    """
+    model = model_assets["model"]
+    if not hasattr(model, "estimators_"):
+        return None
+    arrays = model_assets["extras"].get("compact_forest")
+    forest = CompactForest.from_arrays(arrays) if arrays else CompactForest.from_model(model)
+    if not verify_forest(forest, model, _verification_matrix(forest, model_assets["encoder"])):
+        logger.warning("Compact forest does not match the model; scoring with scikit-learn")
+        return None
+    return forest
+
+def make_process_scorer(model_assets):
+    """A worker-process scorer when CRIME_INFERENCE_BACKEND=process, else None."""
+    if inference_backend() != "process":
+        return None
+    return ProcessScorer(model_assets)
+
+def _score_fn(model_assets):
+    scorer = model_assets.get("process_scorer")
+    if scorer is not None:
+        return scorer
+    forest = model_assets.get("compact_forest")
+    if forest is not None:
+        return forest.predict_proba
+    model = model_assets["model"]
+    model_features = model_assets["model_features"]
+    return lambda X: model.predict_proba(pd.DataFrame(X, columns=model_features))
+
+def make_batcher(model_assets):
+    """Create a micro-batcher that scores feature matrices with the assets' model."""
+    # A worker pool gets one batching thread per worker so every worker can be busy
+    scorer = model_assets.get("process_scorer")
+    return MicroBatcher(
+        _score_fn(model_assets),
+        name=f"batcher-{model_assets['model_version'][:12]}",
+        threads=scorer.workers if scorer is not None else 1,
+    )
+
+def predict_proba(model_assets, X):
+    """Score a feature matrix, through the micro-batcher when the assets have one."""
+    batcher = model_assets.get("batcher")
+    if batcher is None:
+        return _score_fn(model_assets)(X)
+    return batcher.submit(X).result()
+
+def run_inference(model_assets, province, year):
+    """Predict one scenario, returning the forecast and wall-clock time per stage in ms."""
+    timings = {}
+    start = time.perf_counter()
+
+    def mark(stage):
+        nonlocal start
+        now = time.perf_counter()
+        timings[stage] = (now - start) * 1000
+        start = now
+
+    forecast = model_assets["forecast_table"].get((province, year))
+    if forecast is not None:
+        mark("lookup")
+        return forecast, timings
+
+    X = model_assets["encoder"].encode([province], [year])
+    mark("encode")
+    proba = predict_proba(model_assets, X)
+    mark("predict")
+    class_names = decode_classes(model_assets["model"], model_assets["label_encoder"])
+    forecast = decode_probabilities(class_names, proba)[0]
+    mark("decode")
+    return forecast, timings
+
+def submit_inference(model_assets, province, year):
+    """Schedule a prediction on the shared executor and return its future."""
+    return get_executor().submit(run_inference, model_assets, province, year)
@@ -0,0 +1,103 @@
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Column types for the crime export; other columns keep their inferred types
+CRIME_SCHEMA = {
+    "Crime Detail": "category",
+    "Year": "int16",
+    "Province": "category",
+    "Number of Cases": "int32",
+}
+
+CHUNK_ROWS_ENV = "CRIME_DATA_CHUNK_ROWS"
+MAX_MEMORY_ENV = "CRIME_DATA_MAX_MEMORY_MB"
+DEFAULT_CHUNK_ROWS = 500_000
+DEFAULT_MAX_MEMORY_MB = 2048.0
+
+def configured_chunk_rows():
+    """Rows parsed per chunk from the environment, falling back to the default."""
+    try:
+        return max(1, int(os.environ.get(CHUNK_ROWS_ENV, DEFAULT_CHUNK_ROWS)))
+    except ValueError:
+        return DEFAULT_CHUNK_ROWS
+
+def configured_max_memory_mb():
+    """The parsed-data memory ceiling from the environment, falling back to the default."""
+    try:
+        return float(os.environ.get(MAX_MEMORY_ENV, DEFAULT_MAX_MEMORY_MB))
+    except ValueError:
+        return DEFAULT_MAX_MEMORY_MB
+
+def _validate_chunk(chunk, first_row):
+    """Check a parsed chunk against the schema and downcast it in place."""
+    missing = [column for column in CRIME_SCHEMA if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing columns in dataset: {missing}")
+
+    for column, dtype in CRIME_SCHEMA.items():
+        values = chunk[column]
+        if values.isna().any():
+            row = first_row + int(np.flatnonzero(values.isna().to_numpy())[0])
+            raise ValueError(f"Missing value in '{column}' at data row {row}")
+        if dtype == "category":
+            continue
+
+        if not pd.api.types.is_integer_dtype(values):
+            raise ValueError(f"Column '{column}' must contain whole numbers")
+        info = np.iinfo(dtype)
+        low = 0 if column == "Number of Cases" else info.min
+        out_of_range = (values < low) | (values > info.max)
+        if out_of_range.any():
+            row = first_row + int(np.flatnonzero(out_of_range.to_numpy())[0])
+            raise ValueError(f"Value {values.iloc[row - first_row]} in '{column}' at data row {row} is out of range")
+        chunk[column] = values.astype(dtype)
+
+    return chunk
+
+def _concat_chunks(chunks):
+    """Concatenate chunks, merging per-chunk categories instead of falling back to strings."""
+    if not chunks:
+        return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in CRIME_SCHEMA.items()})
+
+    columns = {}
+    for column in chunks[0].columns:
+        parts = [chunk[column] for chunk in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[column] = pd.Series(union_categoricals(parts, sort_categories=True), name=column)
+        else:
+            columns[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+def read_crime_csv(path, chunk_rows=None, max_memory_mb=None, progress=None):
+    """Stream a crime CSV in typed chunks into a compact DataFrame.
+
+    Each chunk is validated and downcast as it arrives. A ``MemoryError`` is
+    raised once the parsed data would exceed ``max_memory_mb``, and
+    ``progress`` (if given) is called with the running row count. Both sizes
+    default to the environment settings.
+    """
+    chunk_rows = chunk_rows or configured_chunk_rows()
+    max_memory_mb = max_memory_mb or configured_max_memory_mb()
+    dtypes = {column: dtype for column, dtype in CRIME_SCHEMA.items() if dtype == "category"}
+    budget = max_memory_mb * 1024 * 1024
+
+    chunks = []
+    rows = 0
+    used = 0
+    with pd.read_csv(path, dtype=dtypes, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            chunk = _validate_chunk(chunk, first_row=rows + 1)
+            used += chunk.memory_usage(deep=True).sum()
+            if used > budget:
+                raise MemoryError(
+                    f"Dataset exceeds the {max_memory_mb:g} MB memory ceiling "
+                    f"after {rows + len(chunk):,} rows"
+                )
+            chunks.append(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows)
+
+    return _concat_chunks(chunks)
@@ -0,0 +1,136 @@
+import json
+import os
+from datetime import datetime, timezone
+import joblib
+import sklearn
+from utils.encoding import FeatureEncoder
+from utils.forecast import artifacts_version, decode_classes, file_hash
+
+BUNDLE_DIR = "model_bundle"
+BUNDLE_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+PAYLOAD_FILE = "model.joblib"
+
+# Separate pickles written by earlier versions of train_model.py
+LEGACY_ARTIFACTS = ("crime_model.pkl", "label_encoder.pkl", "model_features.pkl")
+
+def save_bundle(model, label_encoder, encoder, training_data_hash, directory=BUNDLE_DIR, extras=None):
+    """Write the model, label encoder and feature encoder as one versioned bundle.
+
+    The payload is dumped uncompressed so its numpy arrays can be memory-mapped,
+    and the manifest is written last: a run that dies part-way leaves a manifest
+    that no longer matches the payload, which ``load_bundle`` rejects.
+    """
+    model_features = encoder.feature_names
+    os.makedirs(directory, exist_ok=True)
+    payload_path = os.path.join(directory, PAYLOAD_FILE)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+
+    tmp_payload = f"{payload_path}.tmp"
+    joblib.dump(
+        {
+            "model": model,
+            "label_encoder": label_encoder,
+            "model_features": list(model_features),
+            "encoder": encoder,
+            "extras": extras or {},
+        },
+        tmp_payload,
+    )
+    os.replace(tmp_payload, payload_path)
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sklearn_version": sklearn.__version__,
+        "model_class": type(model).__name__,
+        "model_features": list(model_features),
+        "class_labels": [str(label) for label in label_encoder.classes_],
+        "training_data_hash": training_data_hash,
+        "payload": {
+            "file": PAYLOAD_FILE,
+            "size": os.path.getsize(payload_path),
+            "sha256": file_hash(payload_path),
+        },
+    }
+    tmp_manifest = f"{manifest_path}.tmp"
+    with open(tmp_manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_manifest, manifest_path)
+    return manifest
+
+def read_manifest(directory=BUNDLE_DIR):
+    """Read a bundle manifest without loading the model."""
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+def load_bundle(directory=BUNDLE_DIR, mmap_mode="r"):
+    """Load a model bundle, failing fast if it is incomplete or was built elsewhere.
+
+    With ``mmap_mode`` set, plain numpy arrays in the payload are memory-mapped
+    so that several server processes share one page-cache copy of them.
+    """
+    manifest = read_manifest(directory)
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported model bundle format: {manifest.get('format')}")
+    if manifest["sklearn_version"] != sklearn.__version__:
+        raise ValueError(
+            f"Model bundle was trained with scikit-learn {manifest['sklearn_version']}, "
+            f"but {sklearn.__version__} is installed; re-run train_model.py"
+        )
+
+    payload_path = os.path.join(directory, manifest["payload"]["file"])
+    if os.path.getsize(payload_path) != manifest["payload"]["size"]:
+        raise ValueError("Model bundle payload does not match its manifest; re-run train_model.py")
+
+    payload = joblib.load(payload_path, mmap_mode=mmap_mode)
+    model = payload["model"]
+    label_encoder = payload["label_encoder"]
+    model_features = payload["model_features"]
+    # Bundles written before the encoder was persisted rebuild it from the feature list
+    encoder = payload.get("encoder") or FeatureEncoder.from_feature_names(model_features)
+
+    if encoder.feature_names != model_features:
+        raise ValueError("Model bundle encoder does not match its feature list")
+    if model_features != manifest["model_features"] or getattr(model, "n_features_in_", len(model_features)) != len(model_features):
+        raise ValueError("Model bundle feature list does not match the model")
+    if [str(label) for label in label_encoder.classes_] != manifest["class_labels"]:
+        raise ValueError("Model bundle class labels do not match the label encoder")
+    decode_classes(model, label_encoder)
+
+    return {
+        "model": model,
+        "label_encoder": label_encoder,
+        "model_features": model_features,
+        "encoder": encoder,
+        "model_version": manifest["payload"]["sha256"],
+        "manifest": manifest,
+        "extras": payload["extras"],
+    }
+
+def load_legacy_artifacts():
+    """Load the separate model, label encoder and feature list pickles."""
+    model_path, encoder_path, features_path = LEGACY_ARTIFACTS
+    model = joblib.load(model_path)
+    label_encoder = joblib.load(encoder_path)
+    decode_classes(model, label_encoder)
+    model_features = joblib.load(features_path)
+    return {
+        "model": model,
+        "label_encoder": label_encoder,
+        "model_features": model_features,
+        "encoder": FeatureEncoder.from_feature_names(model_features),
+        "model_version": artifacts_version(LEGACY_ARTIFACTS),
+        "manifest": None,
+        "extras": {},
+    }
+
+def model_artifact_paths(directory=BUNDLE_DIR):
+    """Every file ``load_model_artifacts`` may read, bundle and legacy pickles alike."""
+    return [os.path.join(directory, MANIFEST_FILE), os.path.join(directory, PAYLOAD_FILE), *LEGACY_ARTIFACTS]
+
+def load_model_artifacts(directory=BUNDLE_DIR):
+    """Load the model bundle if one exists, otherwise the legacy pickles."""
+    if os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+        return load_bundle(directory)
+    return load_legacy_artifacts()
@@ -0,0 +1,133 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+import numpy as np
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Instrumentation is off unless this is set to 1 or the page has ?perf=1
+PERF_ENV = "CRIME_DASHBOARD_PERF"
+PERF_QUERY_PARAM = "perf"
+SAMPLE_WINDOW = 500
+
+logger = logging.getLogger("crime_dashboard.perf")
+
+_samples = defaultdict(lambda: deque(maxlen=SAMPLE_WINDOW))
+_samples_lock = threading.Lock()
+_cache_state = threading.local()
+
+def panel_requested():
+    """Whether the current page was opened with the performance query parameter."""
+    try:
+        return st.query_params.get(PERF_QUERY_PARAM) == "1"
+    except Exception:
+        return False
+
+def enabled():
+    """Whether timings should be recorded for this rerun."""
+    return os.environ.get(PERF_ENV) == "1" or panel_requested()
+
+def ensure_log_handler(target=logger):
+    """Send a logger's INFO records to stderr when nothing else is configured, as under ``streamlit run``."""
+    if not target.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        target.addHandler(handler)
+        target.setLevel(logging.INFO)
+
+def record(name, kind, wall_ms, bytes_sent=None, cache=None):
+    """Store one timing sample and emit it as a structured log line."""
+    sample = {"name": name, "kind": kind, "wall_ms": round(wall_ms, 3), "bytes_sent": bytes_sent, "cache": cache}
+    with _samples_lock:
+        _samples[name].append(sample)
+    ensure_log_handler()
+    logger.info(json.dumps({"event": "perf", "ts": time.time(), **sample}))
+
+@contextmanager
+def measure(name):
+    """Time a component's render and count the bytes it sends to the browser."""
+    if not enabled():
+        yield
+        return
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    sent = [0]
+    original = None
+    if ctx is not None:
+        original = ctx._enqueue
+
+        def counting_enqueue(msg):
+            sent[0] += msg.ByteSize()
+            original(msg)
+
+        ctx._enqueue = counting_enqueue
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall_ms = (time.perf_counter() - start) * 1000
+        if ctx is not None:
+            ctx._enqueue = original
+        record(name, "component", wall_ms, bytes_sent=sent[0] if ctx is not None else None)
+
+def cached(name, cache):
+    """Apply a Streamlit cache decorator and record each call's wall time and hit or miss.
+
+    Use in place of the cache decorator: ``@cached("get_filter_index", st.cache_resource)``.
+    A miss is detected by the wrapped function actually running.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            _cache_state.miss = True
+            return fn(*args, **kwargs)
+
+        cached_fn = cache(run)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            if not enabled():
+                return cached_fn(*args, **kwargs)
+            # Save the caller's flag so nested cached calls do not overwrite it
+            outer_miss = getattr(_cache_state, "miss", False)
+            _cache_state.miss = False
+            start = time.perf_counter()
+            try:
+                result = cached_fn(*args, **kwargs)
+            finally:
+                missed = _cache_state.miss
+                _cache_state.miss = outer_miss
+            record(name, "cache", (time.perf_counter() - start) * 1000, cache="miss" if missed else "hit")
+            return result
+
+        call.clear = cached_fn.clear
+        return call
+    return decorate
+
+def summarize():
+    """Rolling percentiles per instrumented name, slowest first."""
+    with _samples_lock:
+        snapshot = {name: list(samples) for name, samples in _samples.items()}
+
+    rows = []
+    for name, samples in snapshot.items():
+        wall = np.array([s["wall_ms"] for s in samples])
+        sent = [s["bytes_sent"] for s in samples if s["bytes_sent"] is not None]
+        caches = [s["cache"] for s in samples if s["cache"] is not None]
+        rows.append({
+            "name": name,
+            "kind": samples[-1]["kind"],
+            "samples": len(samples),
+            "p50_ms": float(np.percentile(wall, 50)),
+            "p95_ms": float(np.percentile(wall, 95)),
+            "p99_ms": float(np.percentile(wall, 99)),
+            "mean_kb_sent": sum(sent) / len(sent) / 1024 if sent else None,
+            "cache_hit_rate": caches.count("hit") / len(caches) if caches else None,
+        })
+    return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
@@ -0,0 +1,150 @@
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import weakref
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from utils.compact_forest import CompactForest
+
+logger = logging.getLogger(__name__)
+
+# "thread" scores in the dashboard process; "process" hands scoring to a worker pool
+INFERENCE_BACKEND_ENV = "CRIME_INFERENCE_BACKEND"
+PROCESS_WORKERS_ENV = "CRIME_INFERENCE_PROCESSES"
+PROCESS_WORKERS = 2
+
+def inference_backend():
+    return os.environ.get(INFERENCE_BACKEND_ENV, "thread").strip().lower()
+
+def process_workers():
+    try:
+        return max(1, int(os.environ.get(PROCESS_WORKERS_ENV, PROCESS_WORKERS)))
+    except ValueError:
+        return PROCESS_WORKERS
+
+def _share(array):
+    """Copy an array into a new shared memory block; returns the block and how to view it."""
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+def _release(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
+    blocks.clear()
+
+# Set in each worker process by _init_worker
+_worker_score = None
+_worker_blocks = []
+
+def _init_worker(kind, payload):
+    """Load the model once per worker: the compact forest from shared memory, else a pickled model."""
+    global _worker_score
+    if kind == "forest":
+        arrays = {}
+        for name, (block_name, shape, dtype) in payload.items():
+            # Spawned workers share the parent's resource tracker, so attaching does not take ownership
+            block = shared_memory.SharedMemory(name=block_name)
+            _worker_blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        _worker_score = CompactForest.from_arrays(arrays).predict_proba
+    else:
+        model, feature_names = pickle.loads(payload)
+        _worker_score = lambda X: model.predict_proba(pd.DataFrame(X, columns=feature_names))
+
+def _score_block(name, n_rows, n_features, n_classes):
+    """Read a feature matrix from a shared block and write the probabilities right after it."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        X = np.ndarray((n_rows, n_features), dtype=np.float64, buffer=block.buf)
+        out = np.ndarray((n_rows, n_classes), dtype=np.float64, buffer=block.buf, offset=X.nbytes)
+        out[...] = _worker_score(X)
+        del X, out
+    finally:
+        block.close()
+
+class ProcessScorer:
+    """A ``score_fn`` that runs the model in a pool of worker processes.
+
+    Workers are spawned once and load the model in their initializer; the
+    compact forest's arrays are placed in shared memory so every worker maps
+    the same pages. Each call passes its feature matrix and receives the
+    probabilities through one shared memory block, so only the block name
+    crosses the pipe. Script threads just wait on the result, leaving the GIL
+    to other sessions. Up to ``workers`` calls run at once. After ``close``, or
+    if a worker dies, calls are scored in the calling process.
+    """
+
+    def __init__(self, model_assets, workers=None):
+        model = model_assets["model"]
+        forest = model_assets.get("compact_forest")
+        self.n_classes = len(model.classes_)
+        self._blocks = []
+        if forest is not None:
+            specs = {}
+            for name, array in forest.to_arrays().items():
+                block, specs[name] = _share(array)
+                self._blocks.append(block)
+            initargs = ("forest", specs)
+            self._local = forest.predict_proba
+        else:
+            feature_names = model_assets["encoder"].feature_names
+            initargs = ("model", pickle.dumps((model, feature_names)))
+            self._local = lambda X: model.predict_proba(pd.DataFrame(X, columns=feature_names))
+
+        self.workers = workers or process_workers()
+        # Spawned rather than forked: the dashboard process runs many threads
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=initargs,
+        )
+        self._closed = False
+        self._lock = threading.Lock()
+        # Frees the shared model arrays on close, garbage collection or interpreter exit
+        self._release = weakref.finalize(self, _release, self._blocks)
+
+    def __call__(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        n_rows, n_features = X.shape
+        block = shared_memory.SharedMemory(create=True, size=max(X.nbytes + n_rows * self.n_classes * 8, 1))
+        try:
+            np.ndarray(X.shape, dtype=np.float64, buffer=block.buf)[...] = X
+            with self._lock:
+                if self._closed:
+                    return self._local(X)
+                job = self._pool.submit(_score_block, block.name, n_rows, n_features, self.n_classes)
+            try:
+                job.result()
+            except CancelledError:
+                # Closed while queued: answer here rather than failing the caller
+                return self._local(X)
+            except BrokenProcessPool:
+                logger.warning("Inference worker pool broke; scoring in the dashboard process from now on")
+                self.close()
+                return self._local(X)
+            out = np.ndarray((n_rows, self.n_classes), dtype=np.float64, buffer=block.buf, offset=X.nbytes)
+            proba = out.copy()
+            del out  # the block cannot be closed while a view of it is alive
+            return proba
+        finally:
+            block.close()
+            block.unlink()
+
+    def close(self):
+        """Shut the workers down once their current jobs finish and free the shared model arrays."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        # Jobs already submitted still run, so callers in flight during a hot reload get their results
+        self._pool.shutdown(wait=True)
+        self._release()
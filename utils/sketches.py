@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+# z-score of the two-sided 95% interval used for every stated error bound
+Z_95 = 1.96
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch with 2**precision one-byte registers.
+
+    The relative standard error is about 1.04 / sqrt(2**precision), 1.6% at
+    the default precision, whatever the number of values added.
+    """
+
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def add(self, values):
+        """Add a column of values; categoricals are hashed by label, not by code."""
+        hashes = pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy()
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        # The remaining bits fit a float64 exactly, so frexp gives their bit length
+        remainder = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        bit_length = np.frexp(remainder.astype(np.float64))[1]
+        rank = (64 - self.precision - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def relative_error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        # Linear counting is more accurate while many registers are still empty
+        if raw <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)
+        return raw
+
+def sample_positions(n_rows, sample_rows, seed=0):
+    """Sorted positions of a uniform sample of rows drawn with replacement, or None when every row fits.
+
+    Drawing with replacement skips the permutation that sampling without it needs.
+    """
+    if n_rows <= sample_rows:
+        return None
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, n_rows, size=sample_rows)
+    positions.sort()
+    return positions
+
+def heavy_hitters(keys, weights, n_rows, top=5):
+    """Estimated totals of ``weights`` per key from a uniform row sample, largest first.
+
+    ``keys`` and ``weights`` are the sampled rows out of ``n_rows``, drawn with
+    replacement as ``sample_positions`` does. Each estimate scales the sampled
+    total by ``n_rows / len(keys)``; ``bound`` is the half-width of its 95%
+    interval. When every row is passed the totals are exact and the bound is 0.
+    """
+    sampled = len(keys)
+    scale = n_rows / sampled
+    weights = np.asarray(weights, dtype=np.float64)
+    frame = pd.DataFrame({"key": keys, "weight": weights, "weight_sq": weights * weights})
+    grouped = frame.groupby("key", observed=True)
+    sums, sums_sq = grouped["weight"].sum(), grouped["weight_sq"].sum()
+
+    # Per-row contribution to a key's total is weight * [row has key]; its variance over the sample
+    variance = (sums_sq - sums ** 2 / sampled) / max(sampled - 1, 1)
+    correction = 0.0 if sampled >= n_rows else 1.0
+    result = pd.DataFrame({
+        "estimate": sums * scale,
+        "bound": Z_95 * n_rows * np.sqrt(variance.clip(lower=0) * correction / sampled),
+    })
+    return result.sort_values("estimate", ascending=False).head(top)
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from utils.aggregates import CUBE_DIMENSIONS
+
+# Columns with at most this many distinct values keep exact value counts;
+# wider ones fall back to log-spaced buckets, so every quartile is within
+# RELATIVE_ACCURACY of the exact one however skewed the column is
+MAX_EXACT_VALUES = 4096
+RELATIVE_ACCURACY = 0.005
+DESCRIBE_INDEX = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+QUANTILES = [0.25, 0.5, 0.75]
+
+def log_buckets(values, relative_accuracy=RELATIVE_ACCURACY):
+    """Round every value to the centre of its log-spaced bucket, as DDSketch does.
+
+    Bucket k holds the magnitudes in (gamma^(k-1), gamma^k] with
+    gamma = (1 + a) / (1 - a), and its centre is within a relative error ``a``
+    of each of them. Negative values use the mirrored buckets and 0 keeps its own.
+    """
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    magnitude = np.abs(values)
+    positive = magnitude > 0
+    keys = np.zeros_like(magnitude)
+    keys[positive] = np.ceil(np.log(magnitude[positive]) / np.log(gamma))
+    return np.where(positive, np.sign(values) * 2 * gamma ** keys / (gamma + 1), 0.0)
+
+class _ColumnStats:
+    """Count, shifted sum and sum of squares, min, max and a value-count sketch per partition."""
+
+    def __init__(self, values, partition_ids, n_partitions, max_exact_values, relative_accuracy):
+        valid = ~np.isnan(values)
+        values, partition_ids = values[valid], partition_ids[valid]
+
+        # Sums are taken around the column mean so the variance does not cancel out
+        self.shift = values.mean() if len(values) else 0.0
+        centered = values - self.shift
+        self.count = np.bincount(partition_ids, minlength=n_partitions)
+        self.sum = np.bincount(partition_ids, weights=centered, minlength=n_partitions)
+        self.sumsq = np.bincount(partition_ids, weights=centered * centered, minlength=n_partitions)
+
+        grouped = pd.Series(values).groupby(partition_ids)
+        self.min = grouped.min().reindex(range(n_partitions)).to_numpy()
+        self.max = grouped.max().reindex(range(n_partitions)).to_numpy()
+
+        distinct = np.unique(values)
+        self.exact = len(distinct) <= max_exact_values
+        if self.exact:
+            self.points = distinct
+            codes = np.searchsorted(distinct, values)
+        else:
+            # The buckets do not depend on the data, so partition counts merge exactly
+            buckets = log_buckets(values, relative_accuracy)
+            self.points = np.unique(buckets)
+            codes = np.searchsorted(self.points, buckets)
+
+        # Sparse (partition, code) -> rows table, so merging costs the number of
+        # non-empty cells in the selected partitions
+        n_codes = len(self.points)
+        cells, counts = np.unique(partition_ids.astype(np.int64) * n_codes + codes, return_counts=True)
+        self.cell_partition = cells // n_codes
+        self.cell_code = cells % n_codes
+        self.cell_count = counts
+
+    def merged_counts(self, selected):
+        keep = selected[self.cell_partition]
+        return np.bincount(self.cell_code[keep], weights=self.cell_count[keep], minlength=len(self.points))
+
+    def quantiles(self, selected, n, lowest, highest):
+        counts = self.merged_counts(selected)
+        cumulative = np.cumsum(counts)
+        result = []
+        for q in QUANTILES:
+            # Linear interpolation between the order statistics around q * (n - 1), as pandas does;
+            # with buckets each order statistic is its bucket's centre
+            position = q * (n - 1)
+            below, fraction = int(np.floor(position)), position - np.floor(position)
+            low = self.points[np.searchsorted(cumulative, below, side="right")]
+            high = self.points[np.searchsorted(cumulative, min(below + 1, n - 1), side="right")]
+            result.append(min(max(low + (high - low) * fraction, lowest), highest))
+        return result
+
+    def describe(self, selected):
+        n = self.count[selected].sum()
+        if not n:
+            return [0.0] + [np.nan] * 7
+        total, total_sq = self.sum[selected].sum(), self.sumsq[selected].sum()
+        mean = total / n
+        std = np.sqrt(max(total_sq - total * mean, 0.0) / (n - 1)) if n > 1 else np.nan
+        lowest, highest = np.nanmin(self.min[selected]), np.nanmax(self.max[selected])
+        if n > 1 and lowest == highest:
+            std = 0.0
+        return [float(n), mean + self.shift, std, lowest, *self.quantiles(selected, n, lowest, highest), highest]
+
+class PartitionStats:
+    """Mergeable summary statistics per (Province, Year, Crime Detail) partition.
+
+    Built in one pass over the rows. A filter combination selects whole
+    partitions, so ``describe`` merges partition summaries instead of scanning
+    rows and its cost follows the number of partitions.
+    """
+
+    def __init__(self, df, dimensions=CUBE_DIMENSIONS, columns=None,
+                 max_exact_values=MAX_EXACT_VALUES, relative_accuracy=RELATIVE_ACCURACY):
+        self.columns = columns or df.select_dtypes(include="number").columns.tolist()
+        self.relative_accuracy = relative_accuracy
+        groups = df.groupby(dimensions, observed=True, dropna=False, sort=True)
+        partition_ids = groups.ngroup().to_numpy()
+        self.partitions = groups.size().index.to_frame(index=False)
+
+        self.stats = {
+            column: _ColumnStats(
+                df[column].to_numpy(dtype=np.float64), partition_ids, len(self.partitions),
+                max_exact_values, relative_accuracy
+            )
+            for column in self.columns
+        }
+
+    @property
+    def exact(self):
+        """Whether every quartile is exact rather than estimated from log-spaced buckets."""
+        return all(stats.exact for stats in self.stats.values())
+
+    def select(self, selections):
+        """Boolean mask of the partitions matching every non-empty selection."""
+        selected = np.ones(len(self.partitions), dtype=bool)
+        for column, values in (selections or {}).items():
+            if values and column in self.partitions:
+                selected &= self.partitions[column].isin(values).to_numpy()
+        return selected
+
+    def describe(self, selections=None):
+        """The same table as ``DataFrame.describe()`` on the numeric columns of the filtered rows."""
+        selected = self.select(selections)
+        return pd.DataFrame(
+            {column: stats.describe(selected) for column, stats in self.stats.items()},
+            index=DESCRIBE_INDEX
+        )
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from utils.aggregates import MEASURE
+
+DATE_COLUMN = "Date"
+# Roughly one point per horizontal pixel of a full-width chart
+MAX_POINTS = 1000
+# Calendar resolutions a series can be summed to before plotting
+RESOLUTIONS = [("D", "day"), ("W", "week"), ("MS", "month"), ("QS", "quarter"), ("YS", "year")]
+
+def daily_series(df):
+    """Total cases per date of the Date column, sorted by date."""
+    dates = df[DATE_COLUMN]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, errors="coerce")
+    series = df[MEASURE].groupby(dates.dt.normalize().to_numpy()).sum()
+    series = series[series.index.notna()]
+    series.index.name = DATE_COLUMN
+    return series.sort_index()
+
+def lttb_indices(x, y, n_out, keep=()):
+    """Largest-Triangle-Three-Buckets: positions of ``n_out`` points that preserve the shape.
+
+    Positions listed in ``keep`` are always included, so extremes used for
+    annotations stay on the line.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], max(edges[i + 1], edges[i] + 1)
+        # Average of the next bucket is the third corner of the triangle
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[stop:max(next_stop, stop + 1)].mean()
+        next_y = y[stop:max(next_stop, stop + 1)].mean()
+
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return np.union1d(selected, np.asarray(keep, dtype=np.intp))
+
+def resolve_series(series, max_points=MAX_POINTS, resolution="D"):
+    """Reduce a case series to at most about ``max_points`` points for plotting.
+
+    Date-indexed series are first summed to ``resolution`` (a pandas offset
+    alias), daily by default. Anything longer than ``max_points`` is thinned
+    with LTTB, keeping the peak and low, so a long daily series keeps its
+    spikes instead of being averaged into weeks. Returns
+    ``(plotted_series, resolution_name)``.
+    """
+    name = None
+    if isinstance(series.index, pd.DatetimeIndex) and len(series):
+        name = dict(RESOLUTIONS).get(resolution, resolution)
+        if resolution != "D":
+            # Label each bucket by its first day so a date maps to the last label at or before it
+            series = series.resample(resolution, label="left", closed="left").sum()
+
+    if len(series) > max_points:
+        values = series.to_numpy()
+        x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else series.index.to_numpy()
+        keep = (int(np.argmax(values)), int(np.argmin(values)))
+        series = series.iloc[lttb_indices(x, values, max_points, keep=keep)]
+    return series, name
+
+def extremes(series):
+    """Peak and low of the full-resolution series as ``(label, value)`` pairs."""
+    return (series.idxmax(), series.max()), (series.idxmin(), series.min())